@@ -20,4 +20,5 @@ class ThreadAdmin(admin.ModelAdmin):
     """Thread model admin."""
 
     model = Thread
-    inlines = (MessageInline,)
\ No newline at end of file
+    inlines = (MessageInline,)
+    list_select_related = ('low_user', 'high_user')
\ No newline at end of file
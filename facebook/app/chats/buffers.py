@@ -0,0 +1,140 @@
+"""Message buffers."""
+
+# Utilities
+import asyncio
+import logging
+from functools import lru_cache
+
+# Channels
+from channels.db import database_sync_to_async
+
+# Django
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+# Models
+from app.chats.models import Message
+
+
+logger = logging.getLogger(__name__)
+
+# Longest wait in seconds between two attempts of a failed flush
+MAX_RETRY_DELAY = 5
+
+
+class BufferFull(Exception):
+    """The queue of the buffer reached its limit."""
+
+
+class MessageBuffer:
+    """
+    Message buffer.
+    Write the chat messages of the process behind their delivery: the
+    messages are queued and inserted together with bulk_create once
+    the delay passed or the batch is full. The flushes run one at a
+    time and each one takes all the queue, so the messages are written
+    in the order they were received. A batch that can not be written
+    goes back to the head of the queue and is retried with backoff,
+    until it failed max_retries times in a row and is dropped. The
+    queue holds up to max_pending messages, the next ones are rejected.
+    """
+
+    def __init__(self, delay, size, max_pending, max_retries):
+        """Start with an empty queue."""
+        self.delay = delay
+        self.size = size
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.pending = []
+        self.lock = asyncio.Lock()
+        self.timer = None
+        self.tasks = set()
+        self.failures = 0
+
+    def add(self, message):
+        """
+        Queue an unsaved message, without waiting for its insert.
+        Raise BufferFull if the queue is at its limit.
+        """
+        if len(self.pending) >= self.max_pending:
+            raise BufferFull()
+        self.pending.append(message)
+        if len(self.pending) >= self.size:
+            self.start_flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(
+                self.delay, self.start_flush)
+
+    def start_flush(self):
+        """Flush the queue in the background."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        task = asyncio.ensure_future(self.flush())
+        # El loop solo guarda referencias debiles a las tareas
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush(self):
+        """Write the queued messages, after the batches taken before."""
+        async with self.lock:
+            batch, self.pending = self.pending, []
+            if not batch:
+                return
+            try:
+                await database_sync_to_async(self.write)(batch)
+            except Exception:
+                logger.exception('Could not write %d chat messages.', len(batch))
+                unsaved = [message for message in batch if message.pk is None]
+                self.failures += 1
+                if self.failures < self.max_retries:
+                    # Vuelven al frente de la cola, antes de los nuevos
+                    self.pending[:0] = unsaved
+                    self.retry()
+                    return
+                logger.error(
+                    'Dropped %d chat messages after %d failed flushes.',
+                    len(unsaved), self.failures)
+                self.failures = 0
+                if self.pending:
+                    self.start_flush()
+            else:
+                self.failures = 0
+
+    def retry(self):
+        """Flush again after a delay that doubles on every failure."""
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = asyncio.get_running_loop().call_later(
+            min(self.delay * 2 ** self.failures, MAX_RETRY_DELAY), self.start_flush)
+
+    @staticmethod
+    def write(batch):
+        """
+        Insert the batch with one query. If a message is rejected,
+        for example because its thread was deleted, the messages are
+        inserted one by one and only the rejected ones are dropped.
+        The inserted messages get their pk.
+        """
+        try:
+            with transaction.atomic():
+                Message.objects.bulk_create(batch)
+            return
+        except IntegrityError:
+            pass
+        for message in list(batch):
+            try:
+                with transaction.atomic():
+                    Message.objects.bulk_create([message])
+            except IntegrityError:
+                logger.exception(
+                    'Dropped a chat message of the thread %s.', message.thread_id)
+                batch.remove(message)
+
+
+@lru_cache(maxsize=None)
+def get_message_buffer():
+    """Return the message buffer of the process."""
+    return MessageBuffer(
+        settings.CHAT_BUFFER_DELAY, settings.CHAT_BUFFER_SIZE,
+        settings.CHAT_BUFFER_MAX_PENDING, settings.CHAT_BUFFER_MAX_RETRIES)
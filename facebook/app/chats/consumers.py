@@ -8,13 +8,44 @@ from asgiref.sync import async_to_sync, sync_to_async
 from channels.consumer import SyncConsumer, AsyncConsumer
 from channels.db import database_sync_to_async
 
+# Django REST Framework
+from rest_framework.exceptions import NotFound
+
+# Buffers
+from app.chats.buffers import BufferFull, get_message_buffer
+
 # Models
 from app.users.models import User
 from app.chats.models import Message, Thread
 
+# Pagination
+from app.chats.pagination import MessageCursorPagination
+
+# Serializers
+from app.chats.serializers import MessageModelSerializer
+
+
+def parse_command(text):
+    """Return the command sent as a JSON object with a command key, or None for a message."""
+    try:
+        command = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(command, dict) and 'command' in command:
+        return command
+    return None
+
 
 class ChatConsumer(AsyncConsumer):
-    """Chat Consumer."""
+    """
+    Chat Consumer.
+    A text is a message for the thread, except the command
+    {"command": "load_older", "cursor": ...} that answers only this
+    socket with the page of messages before the cursor. The messages
+    are delivered first and written behind by the message buffer.
+    A message rejected by a full buffer is not delivered and the
+    socket gets an error instead.
+    """
 
     async def websocket_connect(self, event):
         user = self.scope['user']
@@ -24,17 +55,28 @@ class ChatConsumer(AsyncConsumer):
         self.thread = await sync_to_async(
             Thread.objects.get_or_create_personal_thread)(user, other_user)
 
-        self.room_name = f'personal thread {self.thread.id}'
+        self.room_name = f'personal-thread-{self.thread.id}'
         await self.channel_layer.group_add(self.room_name, self.channel_name)
         await self.send({'type': 'websocket.accept'})
         print(f'[{self.channel_name}] - You are connected.')
 
     async def websocket_receive(self, event):
+        command = parse_command(event.get('text'))
+        if command is not None and command['command'] == 'load_older':
+            await self.load_older(command.get('cursor'))
+            return
+
         print(f'[{self.channel_name}] - Received message - {event["text"]}')
         message = json.dumps(
             {'text': event.get('text'), 'username': self.scope['user'].username})
-        
-        await self.store_message(event.get('text'))
+
+        # Se escribe despues, la entrega no espera el insert
+        try:
+            self.store_message(event.get('text'))
+        except BufferFull:
+            data = {'type': 'error', 'detail': 'The message could not be sent, try again later.'}
+            await self.send({'type': 'websocket.send', 'text': json.dumps(data)})
+            return
 
         await self.channel_layer.group_send(
             self.room_name, {'type': 'websocket.message', 'text': message})
@@ -46,12 +88,33 @@ class ChatConsumer(AsyncConsumer):
     async def websocket_disconnect(self, event):
         print(f'[{self.channel_name}] -Disconnected.')
         await self.channel_layer.group_discard(self.room_name, self.channel_name)
+        await get_message_buffer().flush()
+
+    async def load_older(self, cursor):
+        """Send the page of messages before the cursor to this socket."""
+        # Los mensajes aun en el buffer tambien son historial
+        await get_message_buffer().flush()
+        try:
+            messages, cursor = await self.get_history(cursor)
+        except NotFound as error:
+            data = {'type': 'error', 'detail': str(error.detail)}
+        else:
+            data = {'type': 'history', 'messages': messages, 'cursor': cursor}
+        await self.send({'type': 'websocket.send', 'text': json.dumps(data)})
 
     @database_sync_to_async
+    def get_history(self, cursor):
+        """Return the serialized page of messages before the cursor and the next cursor."""
+        if cursor is not None and not isinstance(cursor, str):
+            raise NotFound(MessageCursorPagination.invalid_cursor_message)
+        messages, cursor = MessageCursorPagination().get_history(
+            self.thread.message_set.select_related('sender'), cursor)
+        return MessageModelSerializer(messages, many=True).data, cursor
+
     def store_message(self, text):
-        """Create a message."""
-        Message.objects.create(
-            thread=self.thread, sender=self.scope['user'], text=text)
+        """Queue a message in the buffer of the process."""
+        get_message_buffer().add(
+            Message(thread=self.thread, sender=self.scope['user'], text=text))
 
 
 class EchoConsumer(SyncConsumer):
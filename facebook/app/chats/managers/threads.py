@@ -1,24 +1,68 @@
 """Thread managers."""
 
 # Django
-from django.db import models
-from django.db.models import Count
+from django.db import connection, models, transaction
+from django.utils import timezone
 
 
 class ThreadManager(models.Manager):
     """Thread manager."""
-    
+
+    PERSONAL_THREAD_SQL = '''
+        WITH found AS (
+            SELECT {columns} FROM {table}
+            WHERE low_user_id = %(low)s AND high_user_id = %(high)s
+        ), inserted AS (
+            INSERT INTO {table} (created, modified, thread_type, low_user_id, high_user_id)
+            SELECT %(now)s, %(now)s, 'personal', %(low)s, %(high)s
+            WHERE NOT EXISTS (SELECT 1 FROM found)
+            ON CONFLICT (low_user_id, high_user_id) DO NOTHING
+            RETURNING {columns}
+        )
+        SELECT *, false FROM found
+        UNION ALL
+        SELECT *, true FROM inserted
+    '''
+
+    @staticmethod
+    def get_pair(user1, user2):
+        """Return the users of a personal thread, the lower id first."""
+        return sorted([user1, user2], key=lambda user: user.pk)
+
+    def get_personal_thread(self, user1, user2):
+        """Return the personal thread of two users, or None."""
+        low, high = self.get_pair(user1, user2)
+        return self.filter(low_user=low, high_user=high).first()
+
     def get_or_create_personal_thread(self, user1, user2):
-        threads = self.get_queryset().filter(thread_type='personal')
-        threads = threads.filter(users__in=[user1, user2]).distinct()
-        threads = threads.annotate(u_count=Count('users')).filter(u_count=2)
-        if threads.exists():
-            return threads.first()
-        else:
-            thread = self.create(thread_type='personal')
-            thread.users.add(user1)
-            thread.users.add(user2)
-            return thread
+        """
+        Return the personal thread of two users, created if they have
+        none, with a single statement on the unique pair of the users.
+        The thread is read without writing when it exists.
+        """
+        low, high = self.get_pair(user1, user2)
+        fields = self.model._meta.concrete_fields
+        sql = self.PERSONAL_THREAD_SQL.format(
+            table=connection.ops.quote_name(self.model._meta.db_table),
+            columns=', '.join(connection.ops.quote_name(field.column) for field in fields))
+        params = {'low': low.pk, 'high': high.pk, 'now': timezone.now()}
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            if row is None:
+                # Otra conexion lo creo entre la lectura y el insert
+                thread = self.get(low_user=low, high_user=high)
+            else:
+                thread = self.model.from_db(
+                    self.db, [field.attname for field in fields], row[:-1])
+                if row[-1]:
+                    thread.users.add(low, high)
+
+        # Los usuarios ya cargados, __str__ no hace consultas
+        thread.low_user, thread.high_user = low, high
+        return thread
 
     def by_user(self, user):
         return self.get_queryset().filter(users__in=[user])
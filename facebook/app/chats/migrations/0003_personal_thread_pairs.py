@@ -0,0 +1,67 @@
+# Generated by Django 3.2.5 on 2026-10-18 11:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_pairs(apps, schema_editor):
+    """
+    Set the pair of users of the personal threads and merge the
+    duplicated threads of a pair, with their messages, into the oldest.
+    """
+    Thread = apps.get_model('chats', 'Thread')
+    Message = apps.get_model('chats', 'Message')
+
+    members = {}
+    rows = Thread.users.through.objects.filter(
+        thread__thread_type='personal').values_list('thread_id', 'user_id')
+    for thread, user in rows.iterator():
+        members.setdefault(thread, []).append(user)
+
+    kept = {}
+    threads = Thread.objects.filter(pk__in=members).order_by('created', 'id')
+    for thread in threads.values_list('pk', flat=True).iterator():
+        users = sorted(members[thread])
+        if len(users) > 2:
+            continue
+        pair = (users[0], users[-1])
+        if pair not in kept:
+            kept[pair] = thread
+            Thread.objects.filter(pk=thread).update(low_user=pair[0], high_user=pair[1])
+        else:
+            Message.objects.filter(thread=thread).update(thread=kept[pair])
+            Thread.objects.filter(pk=thread).delete()
+
+    # The table is altered next in this transaction, fire the checks of the rows now
+    schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('chats', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='thread',
+            options={'ordering': ['-created', '-modified']},
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='high_user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='low_user',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(fill_pairs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='thread',
+            constraint=models.UniqueConstraint(fields=('low_user', 'high_user'), name='unique_personal_thread'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.5 on 2026-10-18 11:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_personal_thread_pairs'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='message',
+            options={'ordering': ['-created', '-modified']},
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='thread',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='chats.thread'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['thread', '-created', '-id'], name='message_thread_idx'),
+        ),
+    ]
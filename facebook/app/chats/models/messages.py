@@ -10,9 +10,19 @@ from app.utils.models import FbModel
 class Message(FbModel):
     """Message model."""
 
-    thread = models.ForeignKey('Thread', on_delete=models.CASCADE)
+    thread = models.ForeignKey('Thread', on_delete=models.CASCADE, db_index=False)
     sender = models.ForeignKey('users.User', on_delete=models.CASCADE)
     text = models.TextField(blank=False, null=False)
 
+    class Meta:
+        """Meta options."""
+        ordering = ['-created', '-modified']
+
+        indexes = [
+            # History pages, newest first by the (created, id) cursor
+            models.Index(
+                fields=['thread', '-created', '-id'], name='message_thread_idx')
+        ]
+
     def __str__(self) -> str:
         return f'From <Thread - {self.thread}>'
\ No newline at end of file
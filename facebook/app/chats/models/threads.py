@@ -29,9 +29,27 @@ class Thread(FbModel):
 
     users = models.ManyToManyField('users.User')
 
+    # Pareja de un hilo personal, el usuario de menor id primero
+    low_user = models.ForeignKey(
+        'users.User', on_delete=models.CASCADE, related_name='+',
+        null=True, blank=True, db_index=False)
+    high_user = models.ForeignKey(
+        'users.User', on_delete=models.CASCADE, related_name='+',
+        null=True, blank=True)
+
     objects = ThreadManager()
 
+    class Meta:
+        """Meta options."""
+        ordering = ['-created', '-modified']
+
+        constraints = [
+            # Group threads have no pair, nulls never conflict
+            models.UniqueConstraint(
+                fields=['low_user', 'high_user'], name='unique_personal_thread')
+        ]
+
     def __str__(self) -> str:
-        if self.thread_type == 'personal' and self.users.count() == 2:
-            return f'{self.users.first()} and {self.users.last()}'
+        if self.thread_type == 'personal' and self.low_user_id is not None:
+            return f'{self.low_user} and {self.high_user}'
         return f'{self.name}'
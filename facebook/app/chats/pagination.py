@@ -0,0 +1,27 @@
+"""Chats pagination."""
+
+# Utilities
+from app.utils.pagination import FbCursorPagination, seek
+
+
+class MessageCursorPagination(FbCursorPagination):
+    """
+    Message cursor pagination.
+    Page the history of a thread newest first, the first page is the
+    last messages of the conversation and every next one goes back.
+    """
+
+    page_size = 50
+
+    def get_history(self, queryset, cursor=None):
+        """
+        Return the page of messages before an opaque cursor and the
+        cursor of the page before it, or None at the first message.
+        Used where there is no request, like the websocket.
+        """
+        position = self.parse_cursor(cursor) if cursor else None
+        results = list(seek(queryset, position, self.ordering)[:self.page_size + 1])
+        page = results[:self.page_size]
+        if len(results) > self.page_size:
+            return page, self.encode_cursor(self.get_position(page[-1]))
+        return page, None
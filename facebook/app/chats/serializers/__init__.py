@@ -0,0 +1 @@
+from .messages import *
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""Messages serializers."""
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from app.chats.models import Message
+
+
+class MessageModelSerializer(serializers.ModelSerializer):
+    """
+    Message model serializer.
+    The sender is its username, as in the messages sent by the
+    websocket.
+    """
+
+    username = serializers.CharField(source='sender.username', read_only=True)
+
+    class Meta:
+        """Meta options."""
+        model = Message
+        fields = ['id', 'username', 'text', 'created']
+        read_only_fields = ['id', 'username', 'text', 'created']
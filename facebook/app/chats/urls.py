@@ -4,9 +4,10 @@
 from django.urls import path
 
 # Views
-from app.chats.views import ThreadView
+from app.chats.views import ThreadView, list_messages
 
 
 urlpatterns = [
-    path('chats/<str:username>/', ThreadView.as_view())
+    path('chats/<str:username>/', ThreadView.as_view()),
+    path('chats/<str:username>/messages/', list_messages)
 ]
\ No newline at end of file
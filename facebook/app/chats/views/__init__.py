@@ -1 +1,2 @@
+from .messages import *
 from .threads import *
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""Messages views."""
+
+# Django REST framework
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.generics import get_object_or_404
+
+# Permissions
+from rest_framework.permissions import IsAuthenticated
+
+# Models
+from app.chats.models import Message, Thread
+from app.users.models import User
+
+# Pagination
+from app.chats.pagination import MessageCursorPagination
+
+# Serializers
+from app.chats.serializers import MessageModelSerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def list_messages(request, username):
+    """List the messages of the personal thread with a user, newest first."""
+    other_user = get_object_or_404(User, username=username)
+    thread = Thread.objects.get_personal_thread(request.user, other_user)
+    messages = Message.objects.filter(thread=thread).select_related('sender')
+    paginator = MessageCursorPagination()
+    page = paginator.paginate_queryset(messages, request)
+    serializer = MessageModelSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
@@ -20,6 +20,9 @@ from rest_framework.response import Response
 # Models
 from app.chats.models import Message, Thread
 
+# Pagination
+from app.chats.pagination import MessageCursorPagination
+
 
 class ThreadView(View):
     """Thread class view."""
@@ -30,20 +33,28 @@ class ThreadView(View):
         return Thread.objects.by_user(self.request.user)
 
     def get_object(self):
-        other_username  = self.kwargs.get('username')
-        self.other_user = get_user_model().objects.get(username=other_username)
-        thread = Thread.objects.get_or_create_personal_thread(
-            self.request.user, self.other_user)
-        if thread == None:
+        """Return the personal thread with the user of the url, looked up once."""
+        if getattr(self, 'thread', None) is None:
+            other_username  = self.kwargs.get('username')
+            self.other_user = get_user_model().objects.get(username=other_username)
+            self.thread = Thread.objects.get_or_create_personal_thread(
+                self.request.user, self.other_user)
+        if self.thread == None:
             raise Http404
-        return thread
+        return self.thread
 
     def get_context_data(self, **kwargs):
+        """Return the thread with its last messages, the older ones are loaded by the websocket."""
+        thread = self.get_object()
+        messages, cursor = MessageCursorPagination().get_history(
+            thread.message_set.select_related('sender'))
+
         context = {}
         context['me'] = self.request.user
-        context['thread'] = self.get_object()
+        context['thread'] = thread
         context['user'] = self.other_user
-        context['messages'] = self.get_object().message_set.all()
+        context['messages'] = messages[::-1]
+        context['cursor'] = cursor
         return context
 
     def get(self, request, **kwargs):
@@ -67,7 +78,6 @@ class ThreadView(View):
             return Response(data, status=status.HTTP_403_FORBIDDEN)
 
     def post(self, request, **kwargs):
-        self.object = self.get_object()
         thread = self.get_object()
         data = request.POST
         user = request.user
@@ -1,12 +1,15 @@
 """Fbpages views."""
 
+# Django
+from django.utils import timezone
+
 # Django REST framework
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 # Filters
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import SearchFilter
 
 # Permissions
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -26,8 +29,17 @@ from app.fbpages.models import Page
 from app.posts.models import Post
 from app.users.models import User
 
+# Utilities
+from app.posts.feeds import invalidate_pulled_sources
+from app.posts.renders import render_states
+from app.utils.conditional import ConditionalMixin
+from app.utils.responses import cache_anonymous, invalidate_responses
+
+# Tasks
+from taskapp.tasks.posts import refresh_feed_source
 
-class PageViewSet(viewsets.ModelViewSet):
+
+class PageViewSet(ConditionalMixin, viewsets.ModelViewSet):
     """
     Page view set.
     Handle create, update, update details a page,
@@ -38,9 +50,10 @@ class PageViewSet(viewsets.ModelViewSet):
     queryset = Page.objects.all()
     serializer_class = PageModelSerializer
     lookup_field = 'slug_name'
-    filter_backends = (SearchFilter, OrderingFilter)
+    filter_backends = (SearchFilter,)
     search_fields = ('slug_name', 'name', 'category__name')
-    ordering_fields = ('name', 'created')
+    conditional_fields = (
+        'modified', 'pagedetail__modified', 'category__name', 'creator__username')
 
     def get_permissions(self):
         """Assign permissions based on action."""
@@ -57,10 +70,23 @@ class PageViewSet(viewsets.ModelViewSet):
 
     def perform_destroy(self, instance):
         """Delete page and page's posts."""
-        posts = Post.objects.filter(
-            destination='PAGE', name_destination=instance.slug_name)
-        posts.delete()
+        # Las publicaciones se borran en cascada
         instance.delete()
+        invalidate_responses('pages', instance.slug_name)
+
+    def perform_update(self, serializer):
+        """Update a page and its posts destination name, drop its cached responses."""
+        page = serializer.save()
+        Post.objects.filter(page=page).exclude(
+            name_destination=page.slug_name).update(
+                name_destination=page.slug_name, modified=timezone.now())
+        invalidate_responses('pages', self.kwargs['slug_name'])
+        invalidate_responses('pages', page.slug_name)
+
+    @cache_anonymous('pages')
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a page, anonymous requests are served from the cache."""
+        return super(PageViewSet, self).retrieve(request, *args, **kwargs)
 
     def create(self, request):
         """Handles page creation."""
@@ -79,9 +105,11 @@ class PageViewSet(viewsets.ModelViewSet):
             data=request.data,
             context={
                 'user': request.user, 'request': request, 
-                'destination': 'PAGE','name_destination': page.slug_name, 'privacy': 'PUBLIC'})
+                'destination': 'PAGE','name_destination': page.slug_name, 'privacy': 'PUBLIC',
+                'page': page})
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_responses('pages', page.slug_name)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['put', 'patch'])
@@ -94,24 +122,37 @@ class PageViewSet(viewsets.ModelViewSet):
             details, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_responses('pages', page.slug_name)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'])
+    @cache_anonymous('pages')
     def posts(self, request, *args, **kwargs):
         """List all page's posts."""
         page = self.get_object()
-        posts = Post.objects.filter(
-            destination='PAGE', name_destination=page.slug_name)
-        data = PostModelSerializer(posts, many=True).data
-        return Response(data, status=status.HTTP_200_OK)
+        posts = PostModelSerializer.setup_eager_loading(
+            Post.objects.filter(page=page))
+
+        if self.paginator.is_streaming(request):
+            return self.paginator.get_streaming_response(
+                posts, request, PostModelSerializer)
+
+        response = self.check_not_modified(
+            render_states(self.paginator.get_window(posts, request)))
+        if response is not None:
+            return response
+
+        results = self.paginate_queryset(posts)
+        data = PostModelSerializer(results, many=True).data
+        return self.get_paginated_response(data)
 
     @action(detail=True, methods=['get'])
     def followers(self, request, *args, **kwargs):
         """List all page's followers."""
         page = self.get_object()
-        followers = page.page_followers
-        serializer = UserModelSummarySerializer(followers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        results = self.paginate_queryset(page.page_followers.all())
+        serializer = UserModelSummarySerializer(results, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def follow(self, request, *args, **kwargs):
@@ -129,6 +170,8 @@ class PageViewSet(viewsets.ModelViewSet):
             data = {
                 'message': f'you stopped following to {page.name}'}
         page.save()
+        invalidate_pulled_sources(user)
+        refresh_feed_source.delay(user.pk, page_pk=page.pk)
         return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='membership',
+            options={'ordering': ['-created', '-modified']},
+        ),
+        migrations.AlterField(
+            model_name='membership',
+            name='group',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='groups.group'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['group', 'user', 'is_active'], name='membership_group_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['group', '-created', '-id'], name='membership_members_idx'),
+        ),
+    ]
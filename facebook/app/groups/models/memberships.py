@@ -16,7 +16,7 @@ class Membership(FbModel):
 
     user = models.ForeignKey("users.User", on_delete=models.CASCADE)
     profile = models.ForeignKey("users.Profile", on_delete=models.CASCADE)
-    group = models.ForeignKey("groups.Group", on_delete=models.CASCADE)
+    group = models.ForeignKey("groups.Group", on_delete=models.CASCADE, db_index=False)
 
     is_admin = models.BooleanField(
         default=False, help_text='Group admin can have action on a group.')
@@ -32,3 +32,15 @@ class Membership(FbModel):
     def __str__(self):
         """Return username and slugname."""
         return "@{} at #{}".format(self.user.username, self.group.slug_name)
+
+    class Meta:
+        """Meta options."""
+        ordering = ['-created', '-modified']
+
+        indexes = [
+            models.Index(
+                fields=['group', 'user', 'is_active'], name='membership_group_user_idx'),
+            models.Index(
+                fields=['group', '-created', '-id'], name='membership_members_idx',
+                condition=models.Q(is_active=True))
+        ]
@@ -1,12 +1,15 @@
 """Groups views."""
 
+# Django
+from django.utils import timezone
+
 # Django REST framework
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 # Filters
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
 # Permissions
@@ -21,8 +24,12 @@ from app.posts.models import Post
 from app.groups.serializers import GroupModelSerializer
 from app.posts.serializers import PostModelSerializer
 
+# Utilities
+from app.posts.renders import render_states
+from app.utils.conditional import ConditionalMixin
+
 
-class GroupeViewSet(viewsets.ModelViewSet):
+class GroupeViewSet(ConditionalMixin, viewsets.ModelViewSet):
     """
     Group view set.
     Handle list, detail, update, partial update, 
@@ -31,10 +38,8 @@ class GroupeViewSet(viewsets.ModelViewSet):
 
     serializer_class = GroupModelSerializer
     lookup_field = 'slug_name'
-    filter_backends = (SearchFilter, OrderingFilter, DjangoFilterBackend)
+    filter_backends = (SearchFilter, DjangoFilterBackend)
     search_fields = ('slug_name', 'name')
-    ordering_fields = ('name', 'created')
-    ordering = ('-members__count',)
     filter_fields = ('is_public',)  # DjangoFilterBackend
 
     def get_permissions(self):
@@ -53,6 +58,13 @@ class GroupeViewSet(viewsets.ModelViewSet):
             return queryset.filter(is_public=True)
         return queryset
 
+    def perform_update(self, serializer):
+        """Update a group and the destination name of its posts."""
+        group = serializer.save()
+        Post.objects.filter(group=group).exclude(
+            name_destination=group.slug_name).update(
+                name_destination=group.slug_name, modified=timezone.now())
+
     def perform_create(self, serializer):
         """Assign group admin."""
         group = serializer.save()
@@ -75,7 +87,18 @@ class GroupeViewSet(viewsets.ModelViewSet):
                 data = {'message': 'You do not have permission to perform this action.'}
                 return Response(data, status=status.HTTP_403_FORBIDDEN)
 
-        posts = Post.objects.filter(
-            destination='GROUP', name_destination=group.slug_name)
-        data = PostModelSerializer(posts, many=True).data
-        return Response(data, status=status.HTTP_200_OK)
+        posts = PostModelSerializer.setup_eager_loading(
+            Post.objects.filter(group=group))
+
+        if self.paginator.is_streaming(request):
+            return self.paginator.get_streaming_response(
+                posts, request, PostModelSerializer)
+
+        response = self.check_not_modified(
+            render_states(self.paginator.get_window(posts, request)))
+        if response is not None:
+            return response
+
+        page = self.paginate_queryset(posts)
+        data = PostModelSerializer(page, many=True).data
+        return self.get_paginated_response(data)
@@ -23,6 +23,7 @@ from app.groups.serializers import MembershipModelSerializer, AddMemberSerialize
 
 # Tasks
 from taskapp.tasks.notifications import create_notification
+from taskapp.tasks.posts import refresh_feed_source
 
 
 class MembershipViewSet(mixins.ListModelMixin,
@@ -73,6 +74,7 @@ class MembershipViewSet(mixins.ListModelMixin,
         invitation = get_object_or_404(Invitation, used_by=user, group=group)
         invitation.delete()
         instance.delete()
+        refresh_feed_source.delay(user.pk, group_pk=group.pk)
 
     def create(self, request, *args, **kwargs):
         """Handle member creation from invitation code."""
@@ -136,8 +138,9 @@ class MembershipViewSet(mixins.ListModelMixin,
     def join_requests(self, request, *args, **kwargs):
         """List all memberships inactive."""
         memberships = self.group.membership_set.filter(is_active=False)
-        data = MembershipModelSerializer(memberships, many=True).data
-        return Response(data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(memberships)
+        data = MembershipModelSerializer(page, many=True).data
+        return self.get_paginated_response(data)
 
     @action(detail=True, methods=['post'])
     def confirm_membership(self, request, *args, **kwargs):
@@ -146,6 +149,7 @@ class MembershipViewSet(mixins.ListModelMixin,
             membership =  self.get_object()
             membership.is_active = True
             membership.save()
+            refresh_feed_source.delay(membership.user_id, group_pk=self.group.pk)
             data = MembershipModelSerializer(membership).data
             return Response(data, status=status.HTTP_200_OK)
         else:
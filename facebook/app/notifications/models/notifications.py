@@ -18,7 +18,8 @@ class Notification(FbModel):
         'users.User', null=True, on_delete=models.SET_NULL)
 
     receiving_user = models.ForeignKey(
-        'users.User', on_delete=models.CASCADE, related_name='receiving_user')
+        'users.User', on_delete=models.CASCADE, related_name='receiving_user',
+        db_index=False)
 
     message = models.CharField(
         help_text='notification message', max_length=200)
@@ -48,3 +49,13 @@ class Notification(FbModel):
     class Meta:
         """Meta options."""
         ordering = ['-created']
+
+        indexes = [
+            models.Index(
+                fields=['receiving_user', '-created', '-id'],
+                name='notification_receiver_idx'),
+            models.Index(
+                fields=['receiving_user', 'notification_type', 'object_id'],
+                name='notification_object_idx'),
+            models.Index(fields=['created'], name='notification_created_idx')
+        ]
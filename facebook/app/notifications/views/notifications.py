@@ -14,12 +14,18 @@ from app.notifications.models import Notification
 from app.posts.models import Post, Comment
 from app.users.models import FriendRequest, User
 
+# Pagination
+from app.utils.pagination import FbCursorPagination
+
 # Serializers
 from app.fbpages.serializers import PageInvitationSerializer
 from app.notifications.serializers import NotificationModelSerializer
 from app.posts.serializers import PostModelSerializer, CommentModelSerializer
 from app.users.serializers import FriendRequestModelSerializer, UserModelSerializer
 
+# Utilities
+from app.utils.conditional import get_rows, get_validators, not_modified, set_validators
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -27,8 +33,18 @@ def list_notifications(request):
     """List all notifications of receiving user."""
     notifications = Notification.objects.filter(
         receiving_user=request.user)
-    data = NotificationModelSerializer(notifications, many=True).data
-    return Response(data, status=status.HTTP_200_OK)
+    paginator = FbCursorPagination()
+
+    validators = get_validators(get_rows(
+        paginator.get_window(notifications, request),
+        ['modified', 'issuing_user__username']), dated=False)
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
+
+    page = paginator.paginate_queryset(notifications, request)
+    data = NotificationModelSerializer(page, many=True).data
+    return set_validators(paginator.get_paginated_response(data), validators)
 
 
 @api_view(['GET'])
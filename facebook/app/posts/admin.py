@@ -5,7 +5,9 @@ from django.contrib import admin
 
 # Models
 from app.posts.models import (CategorySaved,
-                          Comment, Post,
+                          Comment, CommentReactionCount,
+                          FeedEntry, Post,
+                          PostCounterShard, PostReactionCount,
                           ReactionComment,
                           ReactionPost,
                           Saved, Shared)
@@ -105,3 +107,47 @@ class SavedAdmin(admin.ModelAdmin):
     ]
 
     list_filter = ['user']
+
+
+@admin.register(FeedEntry)
+class FeedEntryAdmin(admin.ModelAdmin):
+    """Feed entry model admin."""
+
+    list_display = [
+        'user', 'post', 'post_created'
+    ]
+
+    list_filter = ['user']
+
+
+@admin.register(PostCounterShard)
+class PostCounterShardAdmin(admin.ModelAdmin):
+    """Post counter shard model admin."""
+
+    list_display = [
+        'post', 'counter', 'shard', 'value'
+    ]
+
+    list_filter = ['counter']
+
+
+@admin.register(PostReactionCount)
+class PostReactionCountAdmin(admin.ModelAdmin):
+    """Post reaction count model admin."""
+
+    list_display = [
+        'post', 'reaction', 'count'
+    ]
+
+    list_filter = ['reaction']
+
+
+@admin.register(CommentReactionCount)
+class CommentReactionCountAdmin(admin.ModelAdmin):
+    """Comment reaction count model admin."""
+
+    list_display = [
+        'comment', 'reaction', 'count'
+    ]
+
+    list_filter = ['reaction']
@@ -0,0 +1,171 @@
+"""Counter buffers."""
+
+# Utilities
+from functools import lru_cache
+from threading import Lock
+
+# Django
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+COUNTERS = ['reactions', 'comments', 'shares']
+EPOCH_FIELD = '_epoch'
+
+
+class CounterBuffer:
+    """
+    Counter buffer.
+    Accumulate the counter deltas of the hot posts between two flushes.
+    A flush moves the pending deltas to an in-flight set tagged with
+    an epoch, the in-flight set is kept until the next flush so a
+    reader holding a row older than the epoch can still add it.
+    """
+
+    def add(self, pk, counter, delta):
+        """Add a delta to the pending counter of a post."""
+        raise NotImplementedError
+
+    def read(self, fields):
+        """Return the pending and in-flight values and the in-flight epoch."""
+        raise NotImplementedError
+
+    def begin_flush(self):
+        """Move the pending deltas to the in-flight set and return them."""
+        raise NotImplementedError
+
+    def abort_flush(self):
+        """Move the in-flight deltas back to the pending ones, after a failed flush."""
+        raise NotImplementedError
+
+    def get_pending(self, posts):
+        """
+        Return the deltas not yet in the rows of the posts, by pk.
+        posts: (pk, counter_epoch) pairs, the epoch of the row read.
+        """
+        fields = [
+            '{}:{}'.format(pk, counter) for pk, _ in posts
+            for counter in COUNTERS]
+        pending, inflight, epoch = self.read(fields)
+
+        deltas = {pk: {} for pk, _ in posts}
+        for pk, row_epoch in posts:
+            for counter in COUNTERS:
+                field = '{}:{}'.format(pk, counter)
+                delta = pending.get(field, 0)
+                # Lo que esta en vuelo ya puede estar en la fila
+                if row_epoch < epoch:
+                    delta += inflight.get(field, 0)
+                if delta:
+                    deltas[pk][counter] = delta
+        return deltas
+
+    @staticmethod
+    def parse(values):
+        """Return the deltas of a flushed set as {pk: {counter: delta}}."""
+        deltas = {}
+        for field, delta in values.items():
+            if field == EPOCH_FIELD:
+                continue
+            pk, counter = field.split(':')
+            deltas.setdefault(int(pk), {})[counter] = int(delta)
+        return deltas
+
+
+class LocalCounterBuffer(CounterBuffer):
+    """In-process counter buffer, for tests and single process servers."""
+
+    def __init__(self):
+        """Start with no deltas and the epoch at zero."""
+        self.lock = Lock()
+        self.pending = {}
+        self.inflight = {}
+        self.epoch = 0
+
+    def add(self, pk, counter, delta):
+        """Add a delta to the pending counter of a post."""
+        field = '{}:{}'.format(pk, counter)
+        with self.lock:
+            self.pending[field] = self.pending.get(field, 0) + delta
+
+    def read(self, fields):
+        """Return the pending and in-flight values and the in-flight epoch."""
+        with self.lock:
+            return (
+                {field: self.pending[field] for field in fields if field in self.pending},
+                {field: self.inflight[field] for field in fields if field in self.inflight},
+                self.epoch)
+
+    def begin_flush(self):
+        """Move the pending deltas to the in-flight set and return them."""
+        with self.lock:
+            self.epoch += 1
+            self.inflight, self.pending = self.pending, {}
+            return self.epoch, self.parse(self.inflight)
+
+    def abort_flush(self):
+        """Move the in-flight deltas back to the pending ones, after a failed flush."""
+        with self.lock:
+            for field, delta in self.inflight.items():
+                self.pending[field] = self.pending.get(field, 0) + delta
+            self.inflight = {}
+
+
+class RedisCounterBuffer(CounterBuffer):
+    """Counter buffer kept in Redis hashes, shared by every worker."""
+
+    PENDING_KEY = 'posts:counters:pending'
+    INFLIGHT_KEY = 'posts:counters:inflight'
+    EPOCH_KEY = 'posts:counters:epoch'
+
+    def __init__(self):
+        """Connect to the Redis of the default cache."""
+        # Redis
+        from django_redis import get_redis_connection
+        self.redis = get_redis_connection('default')
+
+    def add(self, pk, counter, delta):
+        """Add a delta to the pending counter of a post."""
+        self.redis.hincrby(self.PENDING_KEY, '{}:{}'.format(pk, counter), delta)
+
+    def read(self, fields):
+        """Return the pending and in-flight values and the in-flight epoch."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hmget(self.PENDING_KEY, fields)
+        pipe.hmget(self.INFLIGHT_KEY, fields + [EPOCH_FIELD])
+        pending, inflight = pipe.execute()
+        epoch = int(inflight.pop() or 0)
+        return (
+            {field: int(value) for field, value in zip(fields, pending) if value},
+            {field: int(value) for field, value in zip(fields, inflight) if value},
+            epoch)
+
+    def begin_flush(self):
+        """Move the pending deltas to the in-flight hash and return them."""
+        epoch = self.redis.incr(self.EPOCH_KEY)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(self.INFLIGHT_KEY)
+        # The epoch field makes sure the pending hash exists
+        pipe.hset(self.PENDING_KEY, EPOCH_FIELD, epoch)
+        pipe.rename(self.PENDING_KEY, self.INFLIGHT_KEY)
+        pipe.hgetall(self.INFLIGHT_KEY)
+        values = pipe.execute()[-1]
+        return epoch, self.parse({
+            field.decode(): value for field, value in values.items()})
+
+    def abort_flush(self):
+        """Move the in-flight deltas back to the pending hash, after a failed flush."""
+        values = self.redis.hgetall(self.INFLIGHT_KEY)
+        pipe = self.redis.pipeline(transaction=True)
+        for field, value in values.items():
+            if field.decode() != EPOCH_FIELD:
+                pipe.hincrby(self.PENDING_KEY, field, int(value))
+        pipe.delete(self.INFLIGHT_KEY)
+        pipe.execute()
+
+
+@lru_cache(maxsize=None)
+def get_counter_buffer():
+    """Return the counter buffer set in the settings, or None."""
+    path = settings.POST_COUNTER_BUFFER
+    return import_string(path)() if path else None
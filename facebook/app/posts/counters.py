@@ -0,0 +1,166 @@
+"""Engagement counters."""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import Case, F, Value, When
+
+# Models
+from app.posts.models import (CommentReactionCount, Post,
+                              PostCounterShard, PostReactionCount)
+
+# Utilities
+from random import randrange
+from app.posts.buffers import COUNTERS, get_counter_buffer
+
+
+FLUSH_LOCK_KEY = 'posts:counters:flush:lock'
+
+
+def increment(instance, counter, delta=1):
+    """
+    Add delta to a counter of a post or a comment.
+    The UPDATE touches only the counter column and is computed by
+    the database, so concurrent writers never overwrite each other.
+    Hot posts add the delta to the counter buffer when there is one,
+    or to a random shard instead of the post row.
+    """
+    if getattr(instance, 'sharded_counters', False):
+        instance.__dict__.pop('_pending_counters', None)
+        buffer = get_counter_buffer()
+        if buffer is not None:
+            buffer.add(instance.pk, counter, delta)
+            return
+
+        PostCounterShard.objects.filter(
+            post_id=instance.pk, counter=counter,
+            shard=randrange(settings.POST_COUNTER_SHARDS)).update(
+                value=F('value') + delta)
+        instance.__dict__.get('_prefetched_objects_cache', {}).pop(
+            'counter_shards', None)
+        return
+
+    type(instance).objects.filter(pk=instance.pk).update(
+        **{counter: F(counter) + delta})
+    setattr(instance, counter, getattr(instance, counter) + delta)
+
+    # Los posts virales pasan a contadores fragmentados
+    if (isinstance(instance, Post)
+            and getattr(instance, counter) >= settings.POST_COUNTER_SHARD_THRESHOLD):
+        shard_counters(instance)
+
+
+def shard_counters(post):
+    """Create the counter shards of a post and start using them."""
+    PostCounterShard.objects.bulk_create([
+        PostCounterShard(post_id=post.pk, counter=counter, shard=shard)
+        for counter, _ in PostCounterShard.COUNTERS
+        for shard in range(settings.POST_COUNTER_SHARDS)],
+        ignore_conflicts=True)
+    Post.objects.filter(pk=post.pk).update(sharded_counters=True)
+    post.sharded_counters = True
+
+
+def fold_counter_shards(post_pk):
+    """
+    Move the value of the shards of a post into its counter columns,
+    so plain column reads (ranking, admin) stay close to the total.
+    """
+    with transaction.atomic():
+        shards = list(PostCounterShard.objects.select_for_update().filter(
+            post_id=post_pk).exclude(value=0).values_list('pk', 'counter', 'value'))
+        if not shards:
+            return
+
+        totals = {}
+        for _, counter, value in shards:
+            totals[counter] = totals.get(counter, 0) + value
+        Post.objects.filter(pk=post_pk).update(
+            **{counter: F(counter) + total for counter, total in totals.items()})
+        PostCounterShard.objects.filter(
+            pk__in=[pk for pk, _, _ in shards]).update(value=0)
+
+
+def flush_counter_buffer():
+    """
+    Write the deltas of the counter buffer into the posts with a
+    single UPDATE, the rows are stamped with the flush epoch. A flush
+    is skipped while another one holds the lock: it would swap the
+    epoch under the deltas still being written.
+    """
+    buffer = get_counter_buffer()
+    if buffer is None:
+        return 0
+    if not cache.add(FLUSH_LOCK_KEY, 1, settings.POST_COUNTER_FLUSH_LOCK_TIMEOUT):
+        return 0
+    try:
+        return write_deltas(buffer)
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def write_deltas(buffer):
+    """Move the deltas of the buffer into the posts, return the rows updated."""
+    epoch, deltas = buffer.begin_flush()
+    if not deltas:
+        return 0
+
+    counters = {
+        counter: F(counter) + Case(
+            *[When(pk=pk, then=Value(values[counter]))
+              for pk, values in deltas.items() if counter in values],
+            default=Value(0))
+        for counter in COUNTERS
+        if any(counter in values for values in deltas.values())}
+    try:
+        return Post.objects.filter(pk__in=list(deltas)).update(
+            **counters, counter_epoch=epoch)
+    except DatabaseError:
+        # Devuelve los deltas al buffer sin dejarlos tambien en vuelo
+        buffer.abort_flush()
+        raise
+
+
+def _reaction_counts(instance):
+    """Return the reaction count model and lookup of a post or comment."""
+    if isinstance(instance, Post):
+        return PostReactionCount, {'post_id': instance.pk}
+    return CommentReactionCount, {'comment_id': instance.pk}
+
+
+def count_reaction(instance, reaction, delta=1):
+    """Add delta to the count of a reaction type of a post or comment."""
+    model, lookup = _reaction_counts(instance)
+    counts = model.objects.filter(**lookup, reaction=reaction)
+    if not counts.update(count=F('count') + delta):
+        model.objects.bulk_create(
+            [model(**lookup, reaction=reaction)], ignore_conflicts=True)
+        counts.update(count=F('count') + delta)
+
+
+def toggle_reaction(model, user, target, reaction):
+    """
+    Toggle the reaction of a user on a post or comment and adjust its
+    counters in the same transaction.
+    model: ReactionPost or ReactionComment.
+    """
+    with transaction.atomic():
+        result = model.objects.toggle(user, target, reaction)
+        if result.removed:
+            increment(target, 'reactions', -1)
+            count_reaction(target, result.old, -1)
+        elif result.pk is not None:
+            if result.old is None:
+                increment(target, 'reactions')
+            else:
+                count_reaction(target, result.old, -1)
+            count_reaction(target, reaction)
+    return result
+
+
+def get_reaction_summary(instance):
+    """Return the reaction counts of a post or comment, most used first."""
+    model, lookup = _reaction_counts(instance)
+    return dict(model.objects.filter(**lookup, count__gt=0).order_by(
+        '-count', 'reaction').values_list('reaction', 'count'))
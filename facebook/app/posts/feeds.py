@@ -0,0 +1,98 @@
+"""Home feeds."""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+# Models
+from app.fbpages.models import Page
+from app.posts.models import FeedEntry, Post
+from app.users.models import Profile
+
+# Utilities
+from heapq import merge
+from app.users.friends import get_pk, friends_of
+from app.utils.pagination import seek
+
+
+PULLED_KEY = 'posts:pulled:{}'
+PULLED_TIMEOUT = 60 * 5
+
+
+def is_pulled(followers_count):
+    """Return True if an audience is too large to be pushed."""
+    return followers_count > settings.FEED_PULL_THRESHOLD
+
+
+def get_pulled_sources(user):
+    """
+    Return the pks of the authors and the pages followed by the user
+    whose posts are pulled at read time. Follower counts are
+    aggregated on the M2M tables and the result is cached briefly.
+    """
+    key = PULLED_KEY.format(get_pk(user))
+    sources = cache.get(key)
+    if sources is not None:
+        return sources
+
+    # Authors followed or befriended by the user
+    following = Profile.followers.through.objects.filter(
+        user_id=get_pk(user)).values_list('profile__user_id', flat=True)
+    authors = set(following) | set(friends_of(user))
+    authors = [
+        row['profile__user_id'] for row in Profile.followers.through.objects.filter(
+            profile__user_id__in=authors).values('profile__user_id').annotate(
+                followers=Count('id')) if is_pulled(row['followers'])]
+
+    # Pages followed by the user
+    pages = Page.page_followers.through.objects.filter(
+        user_id=get_pk(user)).values_list('page_id', flat=True)
+    pages = [
+        row['page_id'] for row in Page.page_followers.through.objects.filter(
+            page_id__in=list(pages)).values('page_id').annotate(
+                followers=Count('id')) if is_pulled(row['followers'])]
+
+    sources = (authors, pages)
+    cache.set(key, sources, PULLED_TIMEOUT)
+    return sources
+
+
+def invalidate_pulled_sources(user):
+    """Drop the cached pulled sources of the user."""
+    cache.delete(PULLED_KEY.format(get_pk(user)))
+
+
+def get_feed_positions(user, position, limit):
+    """
+    Return the (created, pk) positions of the next posts of the feed.
+    The pushed entries of the user and one stream for every pulled
+    author or page are read with the same keyset, each one capped to
+    the limit, and merged newest first with a k-way heap merge.
+    """
+    authors, pages = get_pulled_sources(user)
+
+    streams = [seek(
+        FeedEntry.objects.filter(user=user), position,
+        ordering=('-post_created', '-post_id')).values_list(
+            'post_created', 'post_id')[:limit]]
+
+    for author in authors:
+        streams.append(seek(Post.objects.filter(
+            user_id=author, privacy='PUBLIC',
+            destination__in=['BIOGRAPHY', 'FRIEND']), position).values_list(
+                'created', 'id')[:limit])
+
+    for page in pages:
+        streams.append(seek(Post.objects.filter(
+            page_id=page), position).values_list('created', 'id')[:limit])
+
+    positions = []
+    # Una publicacion puede estar en su bandeja y en un stream
+    for item in merge(*streams, reverse=True):
+        if positions and positions[-1] == item:
+            continue
+        positions.append(item)
+        if len(positions) == limit:
+            break
+    return positions
@@ -0,0 +1,86 @@
+"""Benchmark post visibility command."""
+
+# Utilities
+from time import perf_counter
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+# Models
+from app.posts.models import Post
+from app.users.models import User
+
+
+def legacy_feed(user):
+    """Return the feed queryset built before the visibility predicate."""
+    friends = user.profile.friends.all()
+    return Post.objects.filter(
+        Q(user=user) | Q(privacy='PUBLIC') | Q(user__in=friends, privacy='FRIENDS')
+        | Q(user__in=friends, privacy='SPECIFIC_FRIENDS', specific_friends__in=[user])
+        | Q(specific_friends__in=[user])).exclude(Q(friends_exc__in=[user]))
+
+
+def legacy_is_visible(post, user):
+    """Return the check made by IsFriend before the visibility predicate."""
+    post_owner = post.user
+    friends = post_owner.profile.friends.all()
+    if post.privacy == 'PUBLIC':
+        return True
+    elif post.privacy == 'FRIENDS':
+        return user in friends or user == post_owner
+    elif post.privacy == 'SPECIFIC_FRIENDS':
+        return user in post.specific_friends.all() or user == post_owner
+    elif post.privacy == 'FRIENDS_EXC':
+        return user not in post.friends_exc.all()
+
+
+class Command(BaseCommand):
+    """
+    Benchmark command.
+    Compare the visibility predicate and the single object check
+    against the privacy code paths they replaced.
+    """
+
+    help = 'Benchmark the post visibility engine against the legacy privacy checks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='user whose visibility is measured')
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--limit', type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError('The user does not exist.')
+
+        limit = options['limit']
+        posts = list(Post.objects.all()[:limit])
+
+        def visible_posts():
+            for post in posts:
+                post.__dict__.pop('_visibility_cache', None)
+            return [post.is_visible_to(user) for post in posts]
+
+        cases = [
+            ('feed, legacy Q OR', lambda: list(legacy_feed(user)[:limit])),
+            ('feed, visible_to', lambda: list(Post.objects.visible_to(user)[:limit])),
+            ('objects, legacy IsFriend', lambda: [legacy_is_visible(p, user) for p in posts]),
+            ('objects, is_visible_to', visible_posts),
+        ]
+        for name, case in cases:
+            self.report(name, case, options['iterations'])
+
+    def report(self, name, case, iterations):
+        """Run a case and write its mean time and query count."""
+        with CaptureQueriesContext(connection) as context:
+            start = perf_counter()
+            for _ in range(iterations):
+                case()
+            elapsed = perf_counter() - start
+
+        self.stdout.write('{:<28} {:>10.2f} ms/run {:>8.1f} queries/run'.format(
+            name, elapsed * 1000 / iterations, len(context) / iterations))
@@ -0,0 +1,49 @@
+"""Explain hot queries command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+# Utilities
+from app.posts.plans import analyze, get_hot_queries, get_seq_scans, seed_dataset, walk
+
+
+class Command(BaseCommand):
+    """
+    Explain command.
+    Print the plans checked by the query plan tests on a dataset of
+    any scale, seeded in a transaction that is rolled back.
+    """
+
+    help = 'Check that the hot queries are served by indexes, not sequential scans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=10000,
+            help='rows seeded in the largest tables')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('The query plans are only checked on PostgreSQL.')
+
+        with transaction.atomic():
+            data = seed_dataset(options['scale'])
+            analyze()
+
+            failures = []
+            for name, queryset in get_hot_queries(data):
+                plan, scans = get_seq_scans(queryset)
+                if scans:
+                    failures.append(name)
+                    status = self.style.ERROR('seq scan on ' + ', '.join(scans))
+                else:
+                    status = self.style.SUCCESS(', '.join(sorted({
+                        node['Index Name'] for node in walk(plan) if 'Index Name' in node})))
+                self.stdout.write('{:<28} {}'.format(name, status))
+                if options['verbosity'] > 1:
+                    self.stdout.write(queryset.explain())
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError('Sequential scans in: {}.'.format(', '.join(failures)))
@@ -0,0 +1,3 @@
+from .media import *
+from .posts import *
+from .reactions import *
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Media managers."""
+
+# Django
+from django.db import connection, models
+from django.utils import timezone
+
+
+class MediaBlobManager(models.Manager):
+    """
+    Media blob manager.
+    Keep the count of the rows that point to every stored file.
+    """
+
+    ACQUIRE_SQL = '''
+        INSERT INTO {table} (created, modified, name, size, refcount)
+        VALUES (%(now)s, %(now)s, %(name)s, %(size)s, 1)
+        ON CONFLICT (name) DO UPDATE
+        SET refcount = {table}.refcount + 1, modified = EXCLUDED.modified
+        RETURNING refcount
+    '''
+
+    RELEASE_SQL = '''
+        UPDATE {table} SET refcount = refcount - 1, modified = %(now)s
+        WHERE name = %(name)s
+        RETURNING refcount
+    '''
+
+    # A statement cannot update and delete the same row, so it is a second one
+    DELETE_SQL = '''
+        DELETE FROM {table} WHERE name = %(name)s AND refcount = 0
+    '''
+
+    def execute(self, sql, params):
+        """Run a statement on the table and return the first column, if any."""
+        sql = sql.format(table=connection.ops.quote_name(self.model._meta.db_table))
+        params['now'] = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone() if cursor.description else None
+            return row and row[0]
+
+    def acquire(self, name, size=0):
+        """
+        Add a reference to the stored file, creating its row on the
+        first one. Return the number of references. The row stays
+        locked until the transaction ends.
+        """
+        return self.execute(self.ACQUIRE_SQL, {'name': name, 'size': size})
+
+    def release(self, name):
+        """
+        Remove a reference to the stored file and delete its row with
+        the last one. Return the references left, None for a file
+        stored before the blobs were counted. Call it in a transaction,
+        the row stays locked until the file is deleted.
+        """
+        left = self.execute(self.RELEASE_SQL, {'name': name})
+        if left == 0:
+            self.execute(self.DELETE_SQL, {'name': name})
+        return left
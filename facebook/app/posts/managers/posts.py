@@ -0,0 +1,38 @@
+"""Post managers."""
+
+# Django
+from django.apps import apps
+from django.db import models
+from django.db.models import Exists, OuterRef, Q
+
+
+class PostQuerySet(models.QuerySet):
+    """Post queryset."""
+
+    def visible_to(self, user):
+        """
+        Restrict the posts to the ones the user can see.
+        Friendship and the privacy lists are checked with EXISTS
+        subqueries on the M2M tables, so no row is duplicated
+        and no list is materialized.
+        """
+        if not user.is_authenticated:
+            return self.filter(privacy='PUBLIC')
+
+        Profile = apps.get_model('users', 'Profile')
+        is_friend = Exists(Profile.friends.through.objects.filter(
+            profile_id=OuterRef('profile_id'), user_id=user.pk))
+        is_specific = Exists(self.model.specific_friends.through.objects.filter(
+            post_id=OuterRef('pk'), user_id=user.pk))
+        is_excluded = Exists(self.model.friends_exc.through.objects.filter(
+            post_id=OuterRef('pk'), user_id=user.pk))
+
+        return self.filter(
+            Q(user=user) | Q(privacy='PUBLIC')
+            | Q(is_friend, privacy='FRIENDS')
+            | Q(is_specific, privacy='SPECIFIC_FRIENDS')
+            | Q(is_friend, ~is_excluded, privacy='FRIENDS_EXC'))
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """Post manager."""
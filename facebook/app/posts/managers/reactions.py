@@ -0,0 +1,64 @@
+"""Reaction managers."""
+
+# Utilities
+from collections import namedtuple
+
+# Django
+from django.db import connection, models
+from django.utils import timezone
+
+
+ReactionToggle = namedtuple('ReactionToggle', ['old', 'removed', 'pk'])
+
+
+class ReactionManager(models.Manager):
+    """
+    Reaction manager.
+    target: name of the foreign key to the reacted object.
+    """
+
+    TOGGLE_SQL = '''
+        WITH old AS (
+            SELECT id, reaction FROM {table}
+            WHERE user_id = %(user)s AND {target}_id = %(target)s
+            FOR UPDATE
+        ), removed AS (
+            DELETE FROM {table}
+            WHERE id IN (SELECT id FROM old WHERE reaction = %(reaction)s)
+            RETURNING id
+        ), saved AS (
+            INSERT INTO {table} (created, modified, user_id, profile_id, {target}_id, reaction)
+            SELECT %(now)s, %(now)s, %(user)s, %(profile)s, %(target)s, %(reaction)s
+            WHERE NOT EXISTS (SELECT 1 FROM removed)
+            ON CONFLICT (user_id, {target}_id) DO UPDATE
+            SET reaction = EXCLUDED.reaction, modified = EXCLUDED.modified
+            WHERE EXISTS (SELECT 1 FROM old)
+            RETURNING id
+        )
+        SELECT (SELECT reaction FROM old), EXISTS (SELECT 1 FROM removed),
+               (SELECT id FROM saved)
+    '''
+
+    def __init__(self, target):
+        super(ReactionManager, self).__init__()
+        self.target = target
+
+    def toggle(self, user, target, reaction):
+        """
+        Add, change or remove the reaction of the user with a single
+        statement: the same reaction removes it, another one replaces
+        it. Return the previous reaction type, whether it was removed
+        and the pk of the saved reaction.
+        A concurrent request of the same user that created the row
+        first wins, this one changes nothing.
+        """
+        sql = self.TOGGLE_SQL.format(
+            table=connection.ops.quote_name(self.model._meta.db_table),
+            target=self.target)
+        params = {
+            'user': user.pk, 'profile': user.profile.pk, 'target': target.pk,
+            'reaction': reaction, 'now': timezone.now()}
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return ReactionToggle(*cursor.fetchone())
@@ -0,0 +1,129 @@
+"""Media pipeline."""
+
+from PIL import Image, ImageOps
+
+# Django
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+# Utilities
+import os
+import shutil
+import subprocess
+from io import BytesIO
+from tempfile import NamedTemporaryFile
+from app.posts.storage import share, store
+
+
+# EXIF orientation tag and the values that swap width and height
+ORIENTATION = 0x0112
+ROTATED = (5, 6, 7, 8)
+
+
+def encode(image):
+    """Return the image encoded as a progressive JPEG."""
+    buffer = BytesIO()
+    image.save(
+        buffer, 'JPEG', quality=settings.MEDIA_RENDITION_QUALITY,
+        optimize=True, progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def load_image(file):
+    """
+    Return the image of a file upright and in RGB, with its metadata
+    dropped, and the original width and height of the upright image.
+    """
+    image = Image.open(file)
+    width, height = image.size
+    if image.getexif().get(ORIENTATION) in ROTATED:
+        width, height = height, width
+
+    # Decode large JPEGs at the smallest scale that still covers the full rendition
+    longest = max(settings.MEDIA_RENDITIONS.values())
+    image.draft('RGB', (longest, longest))
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background, (width, height)
+    return image.convert('RGB'), (width, height)
+
+
+def reuse_renditions(picture):
+    """
+    Take the renditions and the dimensions of an already processed
+    picture with the same content. Return whether there was one.
+    """
+    twin = type(picture).objects.filter(content=picture.content.name).exclude(
+        pk=picture.pk).exclude(full='').exclude(full__isnull=True).first()
+    if twin is None:
+        return False
+
+    renditions = [getattr(twin, name) for name in settings.MEDIA_RENDITIONS]
+    if not all(renditions) or not share(renditions):
+        return False
+    for name, rendition in zip(settings.MEDIA_RENDITIONS, renditions):
+        setattr(picture, name, rendition.name)
+    picture.width, picture.height = twin.width, twin.height
+    picture.save()
+    return True
+
+
+def make_renditions(picture):
+    """
+    Save the renditions and the dimensions of a picture. Every
+    rendition is resized from the previous one, largest first,
+    and a picture is never upscaled. A repeated upload reuses the
+    renditions of the first one.
+    """
+    if reuse_renditions(picture):
+        return
+
+    with picture.content.open('rb') as file:
+        image, (picture.width, picture.height) = load_image(file)
+
+    renditions = sorted(settings.MEDIA_RENDITIONS.items(), key=lambda item: -item[1])
+    for name, size in renditions:
+        image.thumbnail((size, size), Image.LANCZOS)
+        field = picture._meta.get_field(name)
+        setattr(picture, name, store(encode(image), field, '.jpg'))
+    picture.save()
+
+
+def grab_frame(path, offset):
+    """Return a JPEG frame of the video at the offset, or None if it is too short."""
+    command = [
+        settings.FFMPEG_BINARY, '-v', 'error', '-ss', str(offset), '-i', path,
+        '-frames:v', '1', '-f', 'image2', '-c:v', 'mjpeg', 'pipe:1']
+    frame = subprocess.run(command, capture_output=True, check=True, timeout=60).stdout
+    return frame or None
+
+
+def make_poster(video):
+    """Save the poster frame and the dimensions of a video."""
+    try:
+        path, temporary = video.content.path, None
+    except NotImplementedError:
+        # Remote storage, ffmpeg needs a seekable local file
+        temporary = NamedTemporaryFile(suffix=os.path.splitext(video.content.name)[1])
+        with video.content.open('rb') as file:
+            shutil.copyfileobj(file, temporary)
+        temporary.flush()
+        path = temporary.name
+
+    try:
+        frame = grab_frame(path, settings.MEDIA_POSTER_OFFSET) or grab_frame(path, 0)
+    finally:
+        if temporary is not None:
+            temporary.close()
+    if frame is None:
+        return
+
+    image, (video.width, video.height) = load_image(BytesIO(frame))
+    size = settings.MEDIA_RENDITIONS['feed']
+    image.thumbnail((size, size), Image.LANCZOS)
+    video.poster = store(encode(image), video._meta.get_field('poster'), '.jpg')
+    video.save()
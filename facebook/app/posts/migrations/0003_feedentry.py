@@ -0,0 +1,80 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_feeds(apps, schema_editor):
+    """Write the existing posts into the home feeds."""
+    FeedEntry = apps.get_model('posts', 'FeedEntry')
+    Membership = apps.get_model('groups', 'Membership')
+    Page = apps.get_model('fbpages', 'Page')
+    Post = apps.get_model('posts', 'Post')
+    User = apps.get_model('users', 'User')
+
+    for post in Post.objects.select_related('profile').iterator():
+        recipients = {post.user_id}
+        if post.destination == 'PAGE':
+            recipients.update(Page.objects.filter(
+                slug_name=post.name_destination, page_followers__isnull=False
+            ).values_list('page_followers', flat=True))
+        elif post.destination == 'GROUP':
+            recipients.update(Membership.objects.filter(
+                group__slug_name=post.name_destination, is_active=True
+            ).values_list('user', flat=True))
+        else:
+            friends = set(post.profile.friends.values_list('pk', flat=True))
+            if post.privacy == 'PUBLIC':
+                recipients.update(friends)
+                recipients.update(post.profile.followers.values_list('pk', flat=True))
+            elif post.privacy == 'FRIENDS':
+                recipients.update(friends)
+            elif post.privacy == 'SPECIFIC_FRIENDS':
+                recipients.update(post.specific_friends.values_list('pk', flat=True))
+            elif post.privacy == 'FRIENDS_EXC':
+                excluded = set(post.friends_exc.values_list('pk', flat=True))
+                recipients.update(friends - excluded)
+            if post.destination == 'FRIEND':
+                recipients.update(User.objects.filter(
+                    username=post.name_destination).values_list('pk', flat=True))
+
+        FeedEntry.objects.bulk_create([
+            FeedEntry(user_id=user_pk, post=post, post_created=post.created)
+            for user_pk in recipients], batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('fbpages', '0002_initial'),
+        ('groups', '0002_initial'),
+        ('posts', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Date time on which the was created', verbose_name='created at')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Date time on which the was las modified.', verbose_name='modified at')),
+                ('post_created', models.DateTimeField(help_text='Date time on which the post was created')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='posts.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-post_created'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['user', '-post_created', '-post'], name='feed_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedentry',
+            constraint=models.UniqueConstraint(fields=('user', 'post'), name='unique_feed_entry'),
+        ),
+        migrations.RunPython(fill_feeds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_feedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='sharded_counters',
+            field=models.BooleanField(default=False, help_text='increments are spread over counter shards'),
+        ),
+        migrations.CreateModel(
+            name='PostCounterShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Date time on which the was created', verbose_name='created at')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Date time on which the was las modified.', verbose_name='modified at')),
+                ('counter', models.CharField(choices=[('reactions', 'reactions'), ('comments', 'comments'), ('shares', 'shares')], max_length=9)),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('value', models.IntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counter_shards', to='posts.post')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='postcountershard',
+            constraint=models.UniqueConstraint(fields=('post', 'counter', 'shard'), name='unique_counter_shard'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_counter_shards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='counter_epoch',
+            field=models.BigIntegerField(default=0, help_text='last counter buffer flush applied to the row'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:39
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_reaction_counts(apps, schema_editor):
+    """Count the existing reactions of posts and comments by type."""
+    for reaction_model, count_model, field in [
+            ('ReactionPost', 'PostReactionCount', 'post'),
+            ('ReactionComment', 'CommentReactionCount', 'comment')]:
+        Reaction = apps.get_model('posts', reaction_model)
+        ReactionCount = apps.get_model('posts', count_model)
+        rows = Reaction.objects.values(field, 'reaction').annotate(
+            total=Count('id')).order_by()
+        ReactionCount.objects.bulk_create([
+            ReactionCount(**{
+                field + '_id': row[field],
+                'reaction': row['reaction'], 'count': row['total']})
+            for row in rows.iterator()], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_counter_epoch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostReactionCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Date time on which the was created', verbose_name='created at')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Date time on which the was las modified.', verbose_name='modified at')),
+                ('reaction', models.CharField(choices=[('LIKE', 'like'), ('LOVE', 'love'), ('CARE', 'care'), ('HAHA', 'haha'), ('SAD', 'sad'), ('ANGRY', 'angry')], max_length=5)),
+                ('count', models.IntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reaction_counts', to='posts.post')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CommentReactionCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Date time on which the was created', verbose_name='created at')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Date time on which the was las modified.', verbose_name='modified at')),
+                ('reaction', models.CharField(choices=[('LIKE', 'like'), ('LOVE', 'love'), ('CARE', 'care'), ('HAHA', 'haha'), ('SAD', 'sad'), ('ANGRY', 'angry')], max_length=5)),
+                ('count', models.IntegerField(default=0)),
+                ('comment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reaction_counts', to='posts.comment')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='postreactioncount',
+            constraint=models.UniqueConstraint(fields=('post', 'reaction'), name='unique_post_reaction_count'),
+        ),
+        migrations.AddConstraint(
+            model_name='commentreactioncount',
+            constraint=models.UniqueConstraint(fields=('comment', 'reaction'), name='unique_comment_reaction_count'),
+        ),
+        migrations.RunPython(fill_reaction_counts, migrations.RunPython.noop),
+    ]
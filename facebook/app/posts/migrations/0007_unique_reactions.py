@@ -0,0 +1,56 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:41
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max
+
+
+def remove_duplicate_reactions(apps, schema_editor):
+    """
+    Keep the last reaction of every user on a post or comment and
+    take the removed ones out of the counters.
+    """
+    for reaction_model, count_model, target_model, target in [
+            ('ReactionPost', 'PostReactionCount', 'Post', 'post'),
+            ('ReactionComment', 'CommentReactionCount', 'Comment', 'comment')]:
+        Reaction = apps.get_model('posts', reaction_model)
+        ReactionCount = apps.get_model('posts', count_model)
+        Target = apps.get_model('posts', target_model)
+
+        duplicates = Reaction.objects.values('user', target).annotate(
+            total=Count('id'), last=Max('id')).filter(total__gt=1).order_by()
+        for row in duplicates.iterator():
+            removed = Reaction.objects.filter(
+                user=row['user'], **{target: row[target]}).exclude(pk=row['last'])
+            for reaction in removed.values_list('reaction', flat=True):
+                ReactionCount.objects.filter(
+                    reaction=reaction, **{target: row[target]}).update(count=F('count') - 1)
+            Target.objects.filter(pk=row[target]).update(
+                reactions=F('reactions') - removed.count())
+            removed.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_reaction_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reactions, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='reactioncomment',
+            options={'ordering': ['-created']},
+        ),
+        migrations.AlterModelOptions(
+            name='reactionpost',
+            options={'ordering': ['-created']},
+        ),
+        migrations.AddConstraint(
+            model_name='reactioncomment',
+            constraint=models.UniqueConstraint(fields=('user', 'comment'), name='unique_comment_reaction'),
+        ),
+        migrations.AddConstraint(
+            model_name='reactionpost',
+            constraint=models.UniqueConstraint(fields=('user', 'post'), name='unique_post_reaction'),
+        ),
+    ]
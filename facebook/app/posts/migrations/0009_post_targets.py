@@ -0,0 +1,63 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:49
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_targets(apps, schema_editor):
+    """Point the existing posts to the group, page or friend named by their destination."""
+    Post = apps.get_model('posts', 'Post')
+    targets = [
+        ('GROUP', 'group', apps.get_model('groups', 'Group'), 'slug_name'),
+        ('PAGE', 'page', apps.get_model('fbpages', 'Page'), 'slug_name'),
+        ('FRIEND', 'target_user', apps.get_model('users', 'User'), 'username'),
+    ]
+    for destination, field, model, name in targets:
+        Post.objects.filter(destination=destination).update(**{field: Subquery(
+            model.objects.filter(**{name: OuterRef('name_destination')}).values('pk')[:1])})
+
+    # The table is indexed next in this transaction, fire the checks of the rows now
+    schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fbpages', '0002_initial'),
+        ('groups', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0008_comment_threads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='group',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='group the post was published in', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='posts', to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='page',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='page the post was published in', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='posts', to='fbpages.page'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='target_user',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='friend whose biography the post was published in', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='wall_posts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(fill_targets, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('group__isnull', False)), fields=['group', '-created', '-id'], name='post_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('page__isnull', False)), fields=['page', '-created', '-id'], name='post_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('target_user__isnull', False)), fields=['target_user', '-created', '-id'], name='post_target_user_idx'),
+        ),
+    ]
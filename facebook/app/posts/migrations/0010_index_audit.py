@@ -0,0 +1,79 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0002_index_audit'),
+        ('posts', '0009_post_targets'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='categorysaved',
+            options={'ordering': ['-created', '-modified']},
+        ),
+        migrations.AlterField(
+            model_name='categorysaved',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='users.profile'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='reactioncomment',
+            name='comment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='posts.comment'),
+        ),
+        migrations.AlterField(
+            model_name='reactionpost',
+            name='post',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='posts.post'),
+        ),
+        migrations.AlterField(
+            model_name='saved',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='categorysaved',
+            index=models.Index(fields=['user', 'name'], name='saved_category_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['user', '-created', '-id'], name='post_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['profile', '-created', '-id'], name='post_profile_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reactioncomment',
+            index=models.Index(fields=['comment', '-created', '-id'], name='reaction_comment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reactionpost',
+            index=models.Index(fields=['post', '-created', '-id'], name='reaction_post_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='saved',
+            index=models.Index(fields=['user', 'post'], name='saved_user_post_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='saved',
+            index=models.Index(fields=['user', '-created', '-id'], name='saved_user_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_index_audit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='feed',
+            field=models.ImageField(blank=True, null=True, upload_to='Images/pictures/posts/renditions/'),
+        ),
+        migrations.AddField(
+            model_name='picture',
+            name='full',
+            field=models.ImageField(blank=True, null=True, upload_to='Images/pictures/posts/renditions/'),
+        ),
+        migrations.AddField(
+            model_name='picture',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='picture',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='Images/pictures/posts/renditions/'),
+        ),
+        migrations.AddField(
+            model_name='picture',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='poster',
+            field=models.ImageField(blank=True, null=True, upload_to='posts/videos/posters/'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
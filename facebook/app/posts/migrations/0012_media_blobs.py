@@ -0,0 +1,59 @@
+# Generated by Django 3.2.5 on 2026-10-18 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_media_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Date time on which the was created', verbose_name='created at')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Date time on which the was las modified.', verbose_name='modified at')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('refcount', models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                'ordering': ['-created', '-modified'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='picture',
+            name='content',
+            field=models.ImageField(blank=True, help_text='Post picture', max_length=255, null=True, upload_to='Images/pictures/posts/'),
+        ),
+        migrations.AlterField(
+            model_name='picture',
+            name='feed',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='Images/pictures/posts/renditions/'),
+        ),
+        migrations.AlterField(
+            model_name='picture',
+            name='full',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='Images/pictures/posts/renditions/'),
+        ),
+        migrations.AlterField(
+            model_name='picture',
+            name='thumbnail',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='Images/pictures/posts/renditions/'),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='content',
+            field=models.FileField(blank=True, help_text='Post video', max_length=255, null=True, upload_to='posts/videos/'),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='poster',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='posts/videos/posters/'),
+        ),
+    ]
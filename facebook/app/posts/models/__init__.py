@@ -1,4 +1,6 @@
 from .comments import *
+from .counters import *
+from .feeds import *
 from .media import *
 from .posts import *
 from .reactions import *
@@ -8,17 +8,55 @@ from app.utils.models import FbModel
 
 
 class Comment(FbModel):
-    """Comment model."""
+    """
+    Comment model.
+    Replies point to their parent comment, the materialized path
+    holds the ids of every ancestor so a whole thread is selected
+    with one prefix match.
+    """
 
     user = models.ForeignKey('users.User', on_delete=models.CASCADE)
     profile = models.ForeignKey('users.Profile', on_delete=models.CASCADE)
     post = models.ForeignKey('posts.Post', on_delete=models.CASCADE)
 
+    parent = models.ForeignKey(
+        'self', help_text='comment replied', on_delete=models.CASCADE,
+        null=True, blank=True, related_name='children')
+
+    path = models.CharField(
+        help_text='zero padded ids from the thread root to the comment',
+        max_length=255, blank=True)
+
     text = models.TextField(help_text='write a comment', max_length=250)
     reactions = models.IntegerField(default=0)
+    replies = models.IntegerField(default=0)
+
+    # Path step of a comment
+    PATH_STEP = '{:010d}/'
+    MAX_DEPTH = 255 // len(PATH_STEP.format(0))
+
+    @property
+    def depth(self):
+        """Return 0 for top level comments, 1 for their replies..."""
+        return self.path.count('/') - 1
 
     def __str__(self):
         """Return username, post title and comment."""
         return '@{} has commented {} on {}'.format(
             self.user.username, 
-            self.text, self.post)
\ No newline at end of file
+            self.text, self.post)
+
+    class Meta:
+        """Meta options."""
+        ordering = ['-created', '-modified']
+
+        indexes = [
+            models.Index(
+                fields=['post', '-created', '-id'], name='comment_top_level_idx',
+                condition=models.Q(parent__isnull=True)),
+            models.Index(
+                fields=['parent', 'created', 'id'], name='comment_replies_idx'),
+            models.Index(
+                fields=['path'], name='comment_path_idx',
+                opclasses=['varchar_pattern_ops'])
+        ]
@@ -0,0 +1,41 @@
+"""Counter models."""
+
+# Django
+from django.db import models
+
+# Utilities
+from app.utils.models import FbModel
+
+
+class PostCounterShard(FbModel):
+    """
+    Post counter shard model.
+    A hot post spreads the increments of a counter over several
+    rows, the value of the counter is the post column plus the
+    sum of its shards.
+    """
+
+    post = models.ForeignKey(
+        'posts.Post', on_delete=models.CASCADE, related_name='counter_shards')
+
+    # counter choices
+    COUNTERS = [
+        ('reactions', 'reactions'),
+        ('comments', 'comments'),
+        ('shares', 'shares')
+    ]
+
+    counter = models.CharField(max_length=9, choices=COUNTERS)
+    shard = models.PositiveSmallIntegerField()
+    value = models.IntegerField(default=0)
+
+    def __str__(self):
+        """Return post, counter and shard."""
+        return '{} {}[{}]'.format(self.post_id, self.counter, self.shard)
+
+    class Meta:
+        """Meta options."""
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'counter', 'shard'], name='unique_counter_shard')
+        ]
@@ -0,0 +1,42 @@
+"""Feed models."""
+
+# Django
+from django.db import models
+
+# Utilities
+from app.utils.models import FbModel
+
+
+class FeedEntry(FbModel):
+    """
+    Feed entry model.
+    A feed entry is a row of the home feed inbox of a user,
+    it is written when a post that the user can see is published.
+    """
+
+    user = models.ForeignKey(
+        'users.User', on_delete=models.CASCADE, related_name='feed_entries')
+
+    post = models.ForeignKey('posts.Post', on_delete=models.CASCADE)
+
+    post_created = models.DateTimeField(
+        help_text='Date time on which the post was created')
+
+    def __str__(self):
+        """Return username and post."""
+        return '@{}: {}'.format(self.user.username, self.post)
+
+    class Meta:
+        """Meta options."""
+        ordering = ['-post_created']
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'], name='unique_feed_entry')
+        ]
+
+        indexes = [
+            models.Index(
+                fields=['user', '-post_created', '-post'],
+                name='feed_user_created_idx')
+        ]
@@ -1,23 +1,110 @@
 """Media models."""
 
 # Django
+from django.conf import settings
 from django.db import models
 
+# Managers
+from app.posts.managers import MediaBlobManager
+
 # Utilities
+import os
 from app.utils.models import FbModel
 
 
+class MediaBlob(FbModel):
+    """
+    Media blob model.
+    A stored media file, named after the SHA-256 of its content, and
+    the number of pictures, videos and renditions that point to it.
+    The file is deleted with the last reference.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    refcount = models.PositiveIntegerField(default=1)
+
+    objects = MediaBlobManager()
+
+    def __str__(self):
+        """Return name and references."""
+        return '{} ({})'.format(self.name, self.refcount)
+
+
 class Picture(FbModel):
-    """Picture model."""
+    """
+    Picture model.
+    The renditions are resized copies of the content made by the
+    media pipeline, they stay empty until it has processed the upload.
+    """
 
     content = models.ImageField(
-        help_text='Post picture', upload_to='Images/pictures/posts/', 
-        blank=True, null=True)
+        help_text='Post picture', upload_to='Images/pictures/posts/',
+        max_length=255, blank=True, null=True)
+
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+
+    thumbnail = models.ImageField(
+        upload_to='Images/pictures/posts/renditions/',
+        max_length=255, blank=True, null=True)
+    feed = models.ImageField(
+        upload_to='Images/pictures/posts/renditions/',
+        max_length=255, blank=True, null=True)
+    full = models.ImageField(
+        upload_to='Images/pictures/posts/renditions/',
+        max_length=255, blank=True, null=True)
 
 
 class Video(FbModel):
-    """Video model."""
+    """
+    Video model.
+    The poster is a frame of the video taken by the media pipeline.
+    """
 
     content = models.FileField(
         help_text='Post video', upload_to='posts/videos/',
-        blank=True, null=True)
+        max_length=255, blank=True, null=True)
+
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+
+    poster = models.ImageField(
+        upload_to='posts/videos/posters/',
+        max_length=255, blank=True, null=True)
+
+
+
+class Upload(FbModel):
+    """
+    Upload model.
+    A post video sent in chunks over several requests. The chunks are
+    written in a staging file at the offset received so far, a
+    finalized upload is moved to the media storage and a post takes
+    its content, with the reference of the upload.
+    """
+
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE)
+
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text='Total size in bytes')
+    offset = models.PositiveBigIntegerField(
+        default=0, help_text='Bytes received so far')
+
+    content = models.FileField(
+        upload_to='posts/videos/', max_length=255, blank=True, null=True)
+
+    @property
+    def staging_path(self):
+        """Return the path of the file with the received chunks."""
+        return os.path.join(settings.UPLOAD_STAGING_ROOT, '{}.part'.format(self.pk))
+
+    @property
+    def is_finished(self):
+        """Return whether the upload was finalized."""
+        return bool(self.content)
+
+    def __str__(self):
+        """Return username, file and progress."""
+        return '@{}: {} ({}/{})'.format(
+            self.user.username, self.filename, self.offset, self.size)
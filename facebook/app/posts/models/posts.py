@@ -3,15 +3,33 @@
 # Django
 from django.db import models
 
+# Managers
+from app.posts.managers import PostManager
+
 # Utilities
+from app.posts.buffers import get_counter_buffer
+from app.users.friends import is_friend
 from app.utils.models import FbModel
 
 
+def load_pending_counters(posts):
+    """Attach to the posts the deltas waiting in the counter buffer."""
+    if not posts:
+        return
+    buffer = get_counter_buffer()
+    if buffer is None:
+        pending = {}
+    else:
+        pending = buffer.get_pending([(post.pk, post.counter_epoch) for post in posts])
+    for post in posts:
+        post._pending_counters = pending.get(post.pk, {})
+
+
 class Post(FbModel):
     """Post model."""
 
-    user = models.ForeignKey('users.User', on_delete=models.CASCADE)
-    profile = models.ForeignKey('users.Profile', on_delete=models.CASCADE)
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, db_index=False)
+    profile = models.ForeignKey('users.Profile', on_delete=models.CASCADE, db_index=False)
 
     about = models.CharField(
         help_text='write something', max_length=350, blank=True)
@@ -63,6 +81,12 @@ class Post(FbModel):
     comments = models.IntegerField(default=0)
     shares = models.IntegerField(default=0)
 
+    sharded_counters = models.BooleanField(
+        help_text='increments are spread over counter shards', default=False)
+
+    counter_epoch = models.BigIntegerField(
+        help_text='last counter buffer flush applied to the row', default=0)
+
     # post destination choices
     TYPE_DESTINATION = [
         ('FRIEND', 'friend'), ('GROUP', 'group'),
@@ -77,10 +101,69 @@ class Post(FbModel):
     name_destination = models.CharField(
         help_text="name of post's destination", max_length=60, blank=True)
 
+    # Destination targets, indexed with the creation below
+    group = models.ForeignKey(
+        'groups.Group', help_text='group the post was published in',
+        on_delete=models.CASCADE, null=True, blank=True,
+        related_name='posts', db_index=False)
+
+    page = models.ForeignKey(
+        'fbpages.Page', help_text='page the post was published in',
+        on_delete=models.CASCADE, null=True, blank=True,
+        related_name='posts', db_index=False)
+
+    target_user = models.ForeignKey(
+        'users.User', help_text='friend whose biography the post was published in',
+        on_delete=models.CASCADE, null=True, blank=True,
+        related_name='wall_posts', db_index=False)
+
     re_post = models.ForeignKey(
         'self', help_text='post to be republished',
         on_delete=models.SET_NULL, null=True)
 
+    # Manager
+    objects = PostManager()
+
+    def is_visible_to(self, user):
+        """
+        Return True if the user can see the post.
+        Follow the same rules as PostQuerySet.visible_to, friendship
+        is read from the friends cache and the result is cached
+        per user on the instance.
+        """
+        cache = self.__dict__.setdefault('_visibility_cache', {})
+        if user.pk in cache:
+            return cache[user.pk]
+
+        if self.privacy == 'PUBLIC' or user.pk == self.user_id:
+            visible = True
+        elif not user.is_authenticated:
+            visible = False
+        elif self.privacy == 'SPECIFIC_FRIENDS':
+            visible = self.specific_friends.filter(pk=user.pk).exists()
+        else:
+            visible = is_friend(self.user_id, user)
+            if visible and self.privacy == 'FRIENDS_EXC':
+                visible = not self.friends_exc.filter(pk=user.pk).exists()
+        cache[user.pk] = visible
+        return visible
+
+    def get_counter(self, counter):
+        """
+        Return the value of a counter. For hot posts the shards and
+        the deltas waiting in the counter buffer are added to the
+        column, use the prefetched ones when they are available.
+        """
+        value = getattr(self, counter)
+        if self.sharded_counters:
+            value += sum(
+                shard.value for shard in self.counter_shards.all()
+                if shard.counter == counter)
+            if '_pending_counters' not in self.__dict__:
+                load_pending_counters([self])
+            value += self._pending_counters.get(counter, 0)
+        return value
+
     def __str__(self):
         """Return about and username"""
         return "{} by @{}".format(self.about, self.user.username)
@@ -88,3 +171,19 @@ class Post(FbModel):
     class Meta:
         """Meta options."""
         ordering = ['-created']
+
+        indexes = [
+            models.Index(
+                fields=['user', '-created', '-id'], name='post_user_idx'),
+            models.Index(
+                fields=['profile', '-created', '-id'], name='post_profile_idx'),
+            models.Index(
+                fields=['group', '-created', '-id'], name='post_group_idx',
+                condition=models.Q(group__isnull=False)),
+            models.Index(
+                fields=['page', '-created', '-id'], name='post_page_idx',
+                condition=models.Q(page__isnull=False)),
+            models.Index(
+                fields=['target_user', '-created', '-id'], name='post_target_user_idx',
+                condition=models.Q(target_user__isnull=False))
+        ]
@@ -3,6 +3,9 @@
 # Django
 from django.db import models
 
+# Managers
+from app.posts.managers import ReactionManager
+
 # Utilities
 from app.utils.models import FbModel
 
@@ -12,7 +15,7 @@ class ReactionPost(FbModel):
 
     user = models.ForeignKey('users.User', on_delete=models.CASCADE)
     profile = models.ForeignKey('users.Profile', on_delete=models.CASCADE)
-    post = models.ForeignKey('posts.Post', on_delete=models.CASCADE)
+    post = models.ForeignKey('posts.Post', on_delete=models.CASCADE, db_index=False)
 
     # Reaction choices
     REACTIONS = [
@@ -24,18 +27,35 @@ class ReactionPost(FbModel):
     reaction = models.CharField(
         help_text='react to a post', max_length=5, choices=REACTIONS)
 
+    # Manager
+    objects = ReactionManager('post')
+
     def __str__(self):
         """Return user, post and reaction."""
         return '@{} reacted to your post {}'.format(
             self.user.username, self.post.pk)
 
+    class Meta:
+        """Meta options."""
+        ordering = ['-created']
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'], name='unique_post_reaction')
+        ]
+
+        indexes = [
+            models.Index(
+                fields=['post', '-created', '-id'], name='reaction_post_idx')
+        ]
+
 
 class ReactionComment(FbModel):
     """Reaction Comment model."""
 
     user = models.ForeignKey('users.User', on_delete=models.CASCADE)
     profile = models.ForeignKey('users.Profile', on_delete=models.CASCADE)
-    comment = models.ForeignKey('posts.Comment', on_delete=models.CASCADE)
+    comment = models.ForeignKey('posts.Comment', on_delete=models.CASCADE, db_index=False)
 
     # Reaction choices
     REACTIONS = [
@@ -47,7 +67,73 @@ class ReactionComment(FbModel):
     reaction = models.CharField(
         help_text='react to a comment', max_length=5, choices=REACTIONS)
 
+    # Manager
+    objects = ReactionManager('comment')
+
     def __str__(self):
         """Return user, post and reaction."""
         return '@{} reacted to your comment {}'.format(
             self.user.username, self.comment.text)
+
+    class Meta:
+        """Meta options."""
+        ordering = ['-created']
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'comment'], name='unique_comment_reaction')
+        ]
+
+        indexes = [
+            models.Index(
+                fields=['comment', '-created', '-id'], name='reaction_comment_idx')
+        ]
+
+
+class PostReactionCount(FbModel):
+    """
+    Post reaction count model.
+    Number of reactions of one type on a post, updated on every
+    react and unreact so the summary is read without counting.
+    """
+
+    post = models.ForeignKey(
+        'posts.Post', on_delete=models.CASCADE, related_name='reaction_counts')
+
+    reaction = models.CharField(max_length=5, choices=ReactionPost.REACTIONS)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        """Return post, reaction and count."""
+        return '{} {}: {}'.format(self.post_id, self.reaction, self.count)
+
+    class Meta:
+        """Meta options."""
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'reaction'], name='unique_post_reaction_count')
+        ]
+
+
+class CommentReactionCount(FbModel):
+    """
+    Comment reaction count model.
+    Number of reactions of one type on a comment.
+    """
+
+    comment = models.ForeignKey(
+        'posts.Comment', on_delete=models.CASCADE, related_name='reaction_counts')
+
+    reaction = models.CharField(max_length=5, choices=ReactionComment.REACTIONS)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        """Return comment, reaction and count."""
+        return '{} {}: {}'.format(self.comment_id, self.reaction, self.count)
+
+    class Meta:
+        """Meta options."""
+        constraints = [
+            models.UniqueConstraint(
+                fields=['comment', 'reaction'], name='unique_comment_reaction_count')
+        ]
@@ -10,18 +10,26 @@ from app.utils.models import FbModel
 class CategorySaved(FbModel):
     """CategorySaved model."""
 
-    user = models.ForeignKey('users.User', on_delete=models.CASCADE)
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=20)
 
     def __str__(self):
         """Return Category's name."""
         return self.name
 
+    class Meta:
+        """Meta options."""
+        ordering = ['-created', '-modified']
+
+        indexes = [
+            models.Index(fields=['user', 'name'], name='saved_category_user_idx')
+        ]
+
 
 class Saved(FbModel):
     """Saved model."""
 
-    user = models.ForeignKey('users.User', on_delete=models.CASCADE)
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, db_index=False)
     post = models.ForeignKey('posts.Post', on_delete=models.CASCADE)
 
     saved_category = models.ForeignKey(
@@ -33,4 +41,9 @@ class Saved(FbModel):
 
     class Meta:
         """Meta options."""
-        ordering = ['-created']
\ No newline at end of file
+        ordering = ['-created']
+
+        indexes = [
+            models.Index(fields=['user', 'post'], name='saved_user_post_idx'),
+            models.Index(fields=['user', '-created', '-id'], name='saved_user_idx')
+        ]
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Posts pagination."""
+
+# Django REST Framework
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import _positive_int
+from rest_framework.utils.urls import replace_query_param
+
+# Utilities
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from app.posts.feeds import get_feed_positions
+from app.posts.ranking import get_ranking
+from app.utils.pagination import FbCursorPagination
+
+
+class FeedCursorPagination(FbCursorPagination):
+    """
+    Feed cursor pagination.
+    Page the home feed of a user by the creation of its posts,
+    pushed entries and pulled posts share the same cursor.
+    """
+
+    def get_feed_window(self, request):
+        """
+        Return the pks of the feed posts that follow the cursor
+        position, one more than the page size. The window is kept
+        so the page and its validators read the feed once.
+        """
+        if getattr(self, 'window', None) is None:
+            self.request = request
+            self.page_size = self.get_page_size(request)
+            position = self.decode_cursor(request)
+            positions = get_feed_positions(
+                request.user, position, self.page_size + 1)
+            self.window = [pk for _, pk in positions]
+        return self.window
+
+    def paginate_feed(self, queryset, request):
+        """Return the feed posts that follow the cursor position."""
+        pks = self.get_feed_window(request)
+        posts = queryset.in_bulk(pks)
+
+        results = [posts[pk] for pk in pks if pk in posts]
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+
+class RankedFeedPagination(FeedCursorPagination):
+    """
+    Ranked feed pagination.
+    The cursor holds an offset into the cached ranking of the user,
+    the first page ranks the feed again.
+    """
+
+    def get_feed_window(self, request):
+        """Return the pks of the ranked feed posts of the page."""
+        if getattr(self, 'window', None) is None:
+            self.request = request
+            self.page_size = self.get_page_size(request)
+            self.offset = self.decode_cursor(request)
+
+            ranking = get_ranking(request.user, refresh=self.offset == 0)
+            self.window = ranking[self.offset:self.offset + self.page_size].tolist()
+            self.has_next = len(ranking) > self.offset + self.page_size
+        return self.window
+
+    def paginate_feed(self, queryset, request):
+        """Return the ranked feed posts that follow the cursor offset."""
+        pks = self.get_feed_window(request)
+        posts = queryset.in_bulk(pks)
+        self.page = [posts[pk] for pk in pks if pk in posts]
+        return self.page
+
+    def get_next_link(self):
+        """Return the url of the next page."""
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self.offset + self.page_size)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, offset):
+        """Return the opaque token of an offset."""
+        return urlsafe_b64encode(str(offset).encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        """Return the offset held by the cursor of the request."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return 0
+
+        try:
+            token = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            return _positive_int(token)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class RepliesCursorPagination(FbCursorPagination):
+    """
+    Replies cursor pagination.
+    Page the replies of a comment oldest first, as a thread is read.
+    """
+
+    ordering = ('created', 'id')
@@ -28,24 +28,4 @@ class IsFriendPostOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         """Check privacy obj and if user is friend of the post owner. """
-        post_owner = obj.post.user
-        friends = post_owner.profile.friends.all()
-        
-        if obj.post.privacy == 'PUBLIC':
-            return True
-        elif obj.post.privacy == 'FRIENDS':
-            if request.user in friends or request.user == post_owner:
-                return True
-            else:
-                return False
-        elif obj.post.privacy == 'SPECIFIC_FRIENDS':
-            if request.user in obj.post.specific_friends.all() or request.user == post_owner:
-                return True
-            else:
-                return False
-        elif obj.post.privacy == 'FRIENDS_EXC':
-            if request.user in obj.post.friends_exc.all():
-                return False
-            else: 
-                return True
-
+        return obj.post.is_visible_to(request.user)
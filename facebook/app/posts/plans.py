@@ -0,0 +1,190 @@
+"""Query plans of the hot queries."""
+
+# Django
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+# Models
+from app.chats.models import Message, Thread
+from app.fbpages.models import Category, Page
+from app.groups.models import Group, Membership
+from app.notifications.models import Notification
+from app.posts.models import (CategorySaved, Comment, FeedEntry, Post,
+                              ReactionPost, Saved)
+from app.users.models import FriendRequest, Profile, User
+
+# Utilities
+import json
+import random
+from datetime import timedelta
+from app.utils.pagination import seek
+
+
+def sample_pairs(rng, left, right, count):
+    """Return up to count distinct (left, right) pairs picked at random."""
+    pairs = set()
+    for _ in range(count):
+        pairs.add((rng.choice(left), rng.choice(right)))
+    return pairs
+
+
+def walk(plan):
+    """Yield every node of an EXPLAIN plan."""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from walk(child)
+
+
+def explain(queryset):
+    """Return the root node of the plan of a queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    # psycopg2 decodes the json column, other drivers return text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+def analyze():
+    """Refresh the planner statistics after seeding."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def get_seq_scans(queryset):
+    """Return the plan of a queryset and the tables it reads with a sequential scan."""
+    plan = explain(queryset)
+    scans = [node['Relation Name'] for node in walk(plan) if node['Node Type'] == 'Seq Scan']
+    return plan, scans
+
+
+def seed_dataset(scale):
+    """Create a random dataset with scale rows in the largest tables."""
+    rng = random.Random(0)
+    now = timezone.now()
+
+    users = User.objects.bulk_create([
+        User(
+            username=f'explain{i}', email=f'explain{i}@example.com',
+            first_name='explain', last_name='explain', password='!')
+        for i in range(max(scale // 50, 100))])
+    profiles = Profile.objects.bulk_create([Profile(user=user) for user in users])
+    profile_of = {profile.user_id: profile for profile in profiles}
+
+    groups = Group.objects.bulk_create([
+        Group(name=f'explain{i}', slug_name=f'explain{i}', about='explain')
+        for i in range(len(users) // 5)])
+    category = Category.objects.create(name='explain')
+    pages = Page.objects.bulk_create([
+        Page(
+            name=f'explain{i}', slug_name=f'explain{i}', about='explain',
+            creator=user, category=category)
+        for i, user in enumerate(users[:len(users) // 5])])
+
+    posts = []
+    for _ in range(scale):
+        user = rng.choice(users)
+        post = Post(user=user, profile=profile_of[user.pk], about='explain')
+        post.destination = rng.choice(['BIOGRAPHY', 'FRIEND', 'GROUP', 'PAGE'])
+        if post.destination == 'FRIEND':
+            post.target_user = rng.choice(users)
+        elif post.destination == 'GROUP':
+            post.group = rng.choice(groups)
+        elif post.destination == 'PAGE':
+            post.page = rng.choice(pages)
+        posts.append(post)
+    posts = Post.objects.bulk_create(posts)
+
+    comments = Comment.objects.bulk_create([
+        Comment(user=user, profile=profile_of[user.pk], post=rng.choice(posts), text='explain')
+        for user in (rng.choice(users) for _ in range(scale // 2))])
+    Comment.objects.bulk_create([
+        Comment(
+            user=user, profile=profile_of[user.pk], post=parent.post,
+            parent=parent, text='explain')
+        for user, parent in (
+            (rng.choice(users), rng.choice(comments)) for _ in range(scale // 2))])
+
+    ReactionPost.objects.bulk_create([
+        ReactionPost(user=user, profile=profile_of[user.pk], post=post, reaction='LIKE')
+        for user, post in sample_pairs(rng, users, posts, scale)])
+    FeedEntry.objects.bulk_create([
+        FeedEntry(user=user, post=post, post_created=post.created)
+        for user, post in sample_pairs(rng, users, posts, scale)])
+    Notification.objects.bulk_create([
+        Notification(
+            issuing_user=issuing, receiving_user=receiving, message='explain',
+            notification_type='reaction post', object_id=rng.choice(posts).pk)
+        for issuing, receiving in sample_pairs(rng, users, users, scale)])
+    FriendRequest.objects.bulk_create([
+        FriendRequest(requesting_user=requesting, requested_user=requested,
+                      accepted=rng.random() < 0.8)
+        for requesting, requested in sample_pairs(rng, users, users, scale)])
+    Membership.objects.bulk_create([
+        Membership(user=user, profile=profile_of[user.pk], group=group, is_active=True)
+        for user, group in sample_pairs(rng, users, groups, scale)])
+    categories = CategorySaved.objects.bulk_create([
+        CategorySaved(user=rng.choice(users), name=f'explain{i}')
+        for i in range(scale // 5)])
+    Saved.objects.bulk_create([
+        Saved(user=category.user, post=post, saved_category=category)
+        for category, post in sample_pairs(rng, categories, posts, scale)])
+
+    threads = Thread.objects.bulk_create([
+        Thread(thread_type='personal', low_user=low, high_user=high)
+        for low, high in {
+            tuple(sorted(pair, key=lambda user: user.pk))
+            for pair in sample_pairs(rng, users, users, scale // 10)}])
+    Message.objects.bulk_create([
+        Message(thread=thread, sender=thread.low_user, text='explain')
+        for thread in (rng.choice(threads) for _ in range(scale))])
+
+    return {
+        'user': users[0], 'other': users[1], 'profile': profiles[0],
+        'group': groups[0], 'page': pages[0], 'post': posts[0],
+        'comment': comments[0], 'thread': threads[0], 'now': now}
+
+
+def get_hot_queries(data):
+    """Return the hot queries of the API, as the views page them."""
+    user, other, post = data['user'], data['other'], data['post']
+
+    def window(queryset, ordering=('-created', '-id')):
+        return seek(queryset, None, ordering)[:21]
+
+    return [
+        ('home feed', window(
+            FeedEntry.objects.filter(user=user), ('-post_created', '-post_id'))),
+        ('author posts', window(Post.objects.filter(
+            user=user, privacy='PUBLIC', destination__in=['BIOGRAPHY', 'FRIEND']))),
+        ('profile posts', window(Post.objects.filter(
+            Q(profile=data['profile'], destination='BIOGRAPHY')
+            | Q(destination='FRIEND', target_user=user)))),
+        ('group posts', window(Post.objects.filter(group=data['group']))),
+        ('page posts', window(Post.objects.filter(page=data['page']))),
+        ('post reactions', window(ReactionPost.objects.filter(post=post))),
+        ('post comments', window(Comment.objects.filter(post=post, parent__isnull=True))),
+        ('comment replies', window(
+            Comment.objects.filter(parent=data['comment']), ('created', 'id'))),
+        ('notifications', window(Notification.objects.filter(receiving_user=user))),
+        ('notification object', Notification.objects.filter(
+            receiving_user=user, notification_type='reaction post', object_id=post.pk)),
+        ('notification purge', Notification.objects.filter(
+            created__lte=data['now'] - timedelta(days=14))),
+        ('pending friend requests', window(
+            FriendRequest.objects.filter(requested_user=user, accepted=False))),
+        ('friend request pair', FriendRequest.objects.filter(
+            requesting_user=user, requested_user=other)),
+        ('membership', Membership.objects.filter(
+            group=data['group'], user=user, is_active=True)),
+        ('group members', window(
+            Membership.objects.filter(group=data['group'], is_active=True))),
+        ('saved categories', CategorySaved.objects.filter(user=user, name='explain0')),
+        ('saved post', Saved.objects.filter(user=user, post=post)),
+        ('saved posts', window(Saved.objects.filter(user=user))),
+        ('personal thread', Thread.objects.filter(low_user=user, high_user=other)),
+        ('message history', window(Message.objects.filter(thread=data['thread']))),
+    ]
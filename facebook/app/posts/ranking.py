@@ -0,0 +1,94 @@
+"""Feed ranking."""
+
+import numpy as np
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+# Models
+from app.posts.models import Comment, Post, ReactionPost
+
+# Utilities
+from array import array
+from app.posts.feeds import get_feed_positions
+from app.users.friends import get_pk, friends_of
+
+
+RANKING_KEY = 'posts:ranking:{}'
+
+
+def get_affinities(user, authors):
+    """
+    Return the affinity of the user with every author: the number of
+    reactions and comments the user left on the author's posts.
+    """
+    interactions = dict.fromkeys(authors, 0)
+    for model in (ReactionPost, Comment):
+        rows = model.objects.filter(
+            user_id=get_pk(user), post__user_id__in=interactions).values(
+                'post__user_id').annotate(total=Count('id'))
+        for row in rows:
+            interactions[row['post__user_id']] += row['total']
+    return interactions
+
+
+def score_posts(user, rows, now=None):
+    """
+    Return the scores of the candidate rows as a NumPy array.
+    Every row is (id, user_id, created, reactions, comments, shares),
+    the whole batch is scored with vectorized operations.
+    """
+    weights = settings.FEED_RANKING_WEIGHTS
+    now = now or timezone.now()
+
+    authors = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    ages = np.fromiter(
+        ((now - row[2]).total_seconds() / 3600 for row in rows),
+        dtype=np.float64, count=len(rows))
+    counters = np.array([row[3:6] for row in rows], dtype=np.float64).reshape(-1, 3)
+
+    # Interaccion del usuario con cada autor
+    affinities = get_affinities(user, set(authors.tolist()))
+    affinity = np.log1p(np.fromiter(
+        (affinities[author] for author in authors.tolist()),
+        dtype=np.float64, count=len(rows)))
+    friends = np.frombuffer(friends_of(user), dtype=np.int64)
+    affinity += weights['friend'] * np.isin(authors, friends)
+
+    engagement = np.log1p(counters) @ np.array(
+        [weights['reactions'], weights['comments'], weights['shares']])
+    decay = np.power(np.maximum(ages, 0) + 2, weights['gravity'])
+    return (1 + engagement) * (1 + weights['affinity'] * affinity) / decay
+
+
+def rank_feed(user):
+    """Return the pks of the candidate posts of the feed, best first."""
+    positions = get_feed_positions(
+        user, None, settings.FEED_RANKING_CANDIDATES)
+    rows = list(Post.objects.filter(pk__in=[pk for _, pk in positions]).values_list(
+        'id', 'user_id', 'created', 'reactions', 'comments', 'shares'))
+    if not rows:
+        return array('q')
+
+    scores = score_posts(user, rows)
+    pks = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    # Ties keep the newest post first
+    order = np.lexsort((-pks, -scores))
+    return array('q', pks[order].tolist())
+
+
+def get_ranking(user, refresh=False):
+    """
+    Return the ranked pks of the feed of the user. The ranking is
+    cached briefly so every page of a pagination reads the same order,
+    the first page refreshes it.
+    """
+    key = RANKING_KEY.format(get_pk(user))
+    ranking = None if refresh else cache.get(key)
+    if ranking is None:
+        ranking = rank_feed(user)
+        cache.set(key, ranking, settings.FEED_RANKING_TIMEOUT)
+    return ranking
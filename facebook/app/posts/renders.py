@@ -0,0 +1,93 @@
+"""Post render cache."""
+
+# Django
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+
+# Django REST Framework
+from rest_framework.renderers import JSONRenderer
+
+# Models
+from app.posts.models import load_pending_counters
+
+# Utilities
+from app.posts.buffers import COUNTERS
+
+
+RENDER_KEY = 'posts:render:{}:{}:{}:{}'
+RENDER_TIMEOUT = 60 * 60 * 24
+STATS_KEY = 'posts:render:stats:{}'
+STATS = ['hits', 'misses', 'bytes_saved']
+
+
+def render_key(post, base=''):
+    """
+    Return the cache key of the rendered post. The key changes with
+    the post, its repost and their authors, so an update or a new
+    username needs no explicit delete.
+    base: absolute url prefix of the media links, if any.
+    """
+    return RENDER_KEY.format(
+        post.pk, get_version(post), get_version(post.re_post), base)
+
+
+def get_version(post):
+    """Return the last modification of a post and of its author."""
+    if post is None:
+        return ''
+    return '{}-{}'.format(post.modified.timestamp(), post.user.modified.timestamp())
+
+
+def render_states(queryset):
+    """
+    Return what the renders of the posts depend on, in the order of
+    the queryset: the pk, the modification of the post, its repost and
+    their authors and the live counters. Only those columns are read.
+    """
+    posts = list(queryset.select_related(None).prefetch_related(None).select_related(
+        'user', 're_post__user').only(
+            'id', 'modified', 'counter_epoch', 'sharded_counters', *COUNTERS,
+            'user__id', 'user__modified',
+            're_post__id', 're_post__modified', 're_post__counter_epoch',
+            're_post__sharded_counters', 're_post__reactions',
+            're_post__user__id', 're_post__user__modified'))
+
+    sharded = [post for post in posts if post.sharded_counters]
+    sharded += [
+        post.re_post for post in posts
+        if post.re_post is not None and post.re_post.sharded_counters]
+    prefetch_related_objects(sharded, 'counter_shards')
+    load_pending_counters(sharded)
+
+    states = []
+    for post in posts:
+        re_post = post.re_post
+        states.append((
+            post.pk, post.modified, post.user.modified,
+            [post.get_counter(counter) for counter in COUNTERS],
+            re_post and (
+                re_post.modified, re_post.user.modified, re_post.get_counter('reactions'))))
+    return states
+
+
+def render_size(data):
+    """Return the size in bytes of the rendered data."""
+    return len(JSONRenderer().render(data))
+
+
+def record_stats(**stats):
+    """Add the counts of a render to the cache stats."""
+    for name, value in stats.items():
+        if value:
+            key = STATS_KEY.format(name)
+            cache.add(key, 0, None)
+            cache.incr(key, value)
+
+
+def get_stats():
+    """Return the hits, misses, bytes saved and hit ratio of the cache."""
+    values = cache.get_many([STATS_KEY.format(name) for name in STATS])
+    stats = {name: values.get(STATS_KEY.format(name), 0) for name in STATS}
+    total = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / total if total else 0
+    return stats
@@ -3,3 +3,4 @@ from .posts import *
 from .reactions import *
 from .saved import *
 from .media import *
+from .uploads import *
@@ -1,5 +1,8 @@
 """Comment serializers."""
 
+# Django
+from django.db import transaction
+
 # Django REST Framework
 from rest_framework import serializers
 
@@ -9,33 +12,59 @@ from app.posts.models import Comment
 # Tasks
 from taskapp.tasks.notifications import create_notification
 
+# Utilities
+from app.posts.counters import increment
+
 
 class CommentModelSerializer(serializers.ModelSerializer):
     """Post model serializer."""
 
     user = serializers.StringRelatedField(read_only=True)
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.all(), required=False)
 
     class Meta:
         """Meta options."""
         model = Comment
-        fields = ['user', 'text', 'reactions']
+        fields = [
+            'id', 'user', 'text',
+            'reactions', 'parent', 'replies'
+        ]
 
         read_only_fields = [
-            'user', 'reactions'
+            'user', 'reactions', 'replies'
         ]
 
+    def validate_parent(self, parent):
+        """Verify that the replied comment is on the same post."""
+        if self.instance is not None:
+            raise serializers.ValidationError('A comment can not be moved.')
+        if parent.post_id != self.context['post'].pk:
+            raise serializers.ValidationError(
+                'The comment replied is not on this post.')
+        if parent.depth + 1 >= Comment.MAX_DEPTH:
+            raise serializers.ValidationError('The thread is too deep.')
+        return parent
+
     def create(self, data):
         """Create a comment."""
         # comment
         user = self.context['user']
         profile = user.profile
         post = self.context['post']
-        comment = Comment.objects.create(
-            **data, user=user, profile=profile, post=post)
+        parent = data.get('parent')
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                **data, user=user, profile=profile, post=post)
+
+            # Thread
+            comment.path = (parent.path if parent else '') + Comment.PATH_STEP.format(comment.pk)
+            Comment.objects.filter(pk=comment.pk).update(path=comment.path)
+            if parent is not None:
+                increment(parent, 'replies')
 
         # Post
-        post.comments += 1
-        post.save()
+        increment(post, 'comments')
         if user != post.user:
             type = 'Comment Post'
             create_notification.delay(
@@ -8,22 +8,30 @@ from app.posts.models import Picture, Video
 
 
 class ImageModelSerializer(serializers.ModelSerializer):
-    """Image model serializer."""
+    """
+    Image model serializer.
+    The renditions are null until the media pipeline made them.
+    """
 
     content = serializers.ImageField(max_length=1000)
 
     class Meta:
         """Meta options."""
         model = Picture
-        fields = ['content']
+        fields = ['content', 'width', 'height', 'thumbnail', 'feed', 'full']
+        read_only_fields = ['width', 'height', 'thumbnail', 'feed', 'full']
 
 
 class VideoModelSerializer(serializers.ModelSerializer):
-    """Video model serializer."""
+    """
+    Video model serializer.
+    The poster is null until the media pipeline made it.
+    """
 
     content = serializers.FileField(max_length=1000)
 
     class Meta:
         """Meta options."""
         model = Video
-        fields = ['content']
\ No newline at end of file
+        fields = ['content', 'width', 'height', 'poster']
+        read_only_fields = ['width', 'height', 'poster']
\ No newline at end of file
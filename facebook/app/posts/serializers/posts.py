@@ -1,18 +1,30 @@
 """Posts serializers."""
 
+# Django
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import prefetch_related_objects
+
 # Django REST Framework
 from rest_framework import serializers
 
 # Models
 from app.groups.models import Membership
-from app.posts.models import Picture, Post, Shared, Video
+from app.posts.models import Picture, Post, Shared, Upload, Video, load_pending_counters
 from app.users.models import User
 
 # Serializers
 from .media import ImageModelSerializer, VideoModelSerializer
 
+# Utilities
+from app.posts.counters import increment
+from app.posts.renders import RENDER_TIMEOUT, record_stats, render_key, render_size
+from app.posts.storage import store
+
 # Tasks
 from taskapp.tasks.notifications import create_notification
+from taskapp.tasks.media import process_media
+from taskapp.tasks.posts import fan_out_post
 
 
 class SharedPostModelSerializer(serializers.ModelSerializer):
@@ -24,7 +36,14 @@ class SharedPostModelSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     pictures = ImageModelSerializer(read_only=True, many=True)
     videos = VideoModelSerializer(read_only=True, many=True)  
-    tag_friends = serializers.StringRelatedField(required=False, many=True)  
+    tag_friends = serializers.StringRelatedField(read_only=True, many=True)
+
+    # Query plan
+    select_related_fields = ['user']
+    prefetch_related_fields = ['pictures', 'videos', 'tag_friends']
+
+    # Read from the instance on every render
+    live_fields = ['reactions']
 
     class Meta:
         """Meta options."""
@@ -40,14 +59,61 @@ class SharedPostModelSerializer(serializers.ModelSerializer):
             'user', 'reactions'
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset, prefix=''):
+        """
+        Apply the query plan of the serializer to a queryset, so
+        serializing a page costs the same queries for any page size.
+        prefix: lookup path to the post when the queryset is of
+        another model, for example 'post__'.
+        """
+        queryset = queryset.select_related(
+            *[prefix + field for field in cls.select_related_fields])
+        return queryset.prefetch_related(
+            *[prefix + field for field in cls.prefetch_related_fields])
+
+    def merge_live_fields(self, data, instance):
+        """Overwrite the live fields of a cached render."""
+        for field in self.live_fields:
+            data[field] = instance.get_counter(field)
+        return data
+
+
+class PostListSerializer(serializers.ListSerializer):
+    """Post list serializer, render the whole page at once."""
+
+    def to_representation(self, data):
+        """Render the posts with a single cache lookup."""
+        posts = data.all() if isinstance(data, models.Manager) else data
+        return self.child.render_many(list(posts))
+
 
 class PostModelSerializer(SharedPostModelSerializer):
-    """Post model serializer."""
+    """
+    Post model serializer.
+    Renders are cached by post version, the live fields
+    are merged into the cached render afterwards.
+    """
 
     re_post = SharedPostModelSerializer(read_only=True)
 
+    # Ids of finalized chunked uploads, published as videos of the post
+    uploads = serializers.ListField(
+        child=serializers.IntegerField(), write_only=True, required=False)
+
+    # Query plan
+    select_related_fields = ['user', 're_post__user']
+    prefetch_related_fields = [
+        'pictures', 'videos', 'tag_friends',
+        're_post__pictures', 're_post__videos', 're_post__tag_friends'
+    ]
+
+    # Read from the instance on every render
+    live_fields = ['reactions', 'comments', 'shares']
+
     class Meta:
         """Meta options."""
+        list_serializer_class = PostListSerializer
         model = Post
         fields = [
             'user','about', 'pictures',
@@ -55,7 +121,7 @@ class PostModelSerializer(SharedPostModelSerializer):
             'location', 'tag_friends',
             'reactions', 'destination',
             'name_destination', 're_post',
-            'comments', 'shares' 
+            'comments', 'shares', 'uploads'
         ]
 
         read_only_fields = [
@@ -65,6 +131,66 @@ class PostModelSerializer(SharedPostModelSerializer):
             'shares'
         ]
 
+    def to_representation(self, instance):
+        """Return the render of the post."""
+        return self.render_many([instance])[0]
+
+    def render_many(self, posts):
+        """
+        Return the renders of the posts. Cached renders are read with
+        one get_many, the missing ones are rendered and stored.
+        """
+        request = self.context.get('request')
+        base = request.build_absolute_uri('/') if request else ''
+
+        # Shards and buffered deltas of the hot posts, once for the whole page
+        sharded = [post for post in posts if post.sharded_counters]
+        sharded += [
+            post.re_post for post in posts
+            if post.re_post is not None and post.re_post.sharded_counters]
+        prefetch_related_objects(sharded, 'counter_shards')
+        load_pending_counters(sharded)
+        keys = [render_key(post, base) for post in posts]
+        cached = cache.get_many(keys)
+
+        renders, missing, saved = [], {}, 0
+        for key, post in zip(keys, posts):
+            if key in cached:
+                size, data = cached[key]
+                saved += size
+            else:
+                data = super(PostModelSerializer, self).to_representation(post)
+                missing[key] = (render_size(data), data)
+            renders.append(self.merge_live_fields(dict(data), post))
+
+        if missing:
+            cache.set_many(missing, RENDER_TIMEOUT)
+        record_stats(
+            hits=len(posts) - len(missing), misses=len(missing), bytes_saved=saved)
+        return renders
+
+    def merge_live_fields(self, data, instance):
+        """Overwrite the live fields of the post and its repost."""
+        data = super(PostModelSerializer, self).merge_live_fields(data, instance)
+        if data['re_post'] is not None:
+            data['re_post'] = self.fields['re_post'].merge_live_fields(
+                dict(data['re_post']), instance.re_post)
+        return data
+
+    def validate_uploads(self, pks):
+        """Verify that the uploads belong to the user and are finalized."""
+        if self.instance is not None:
+            raise serializers.ValidationError(
+                'Uploads can only be published when the post is created.')
+        uploads = Upload.objects.filter(
+            pk__in=pks, user=self.context['request'].user).in_bulk()
+        for pk in pks:
+            if pk not in uploads:
+                raise serializers.ValidationError(f'The upload {pk} does not exist.')
+            if not uploads[pk].is_finished:
+                raise serializers.ValidationError(f'The upload {pk} is not finalized.')
+        return list(dict.fromkeys(pks))
+
     def validate(self, data):
         """
         verify privacy and that only the about, destination and 
@@ -98,21 +224,11 @@ class PostModelSerializer(SharedPostModelSerializer):
                 raise serializers.ValidationError(
                     'You must specify privacy in FRIENDS_EXC or SPECIFIC_FRIENDS.')
 
-        # Group post validation
-        if data['destination'] in ['GROUP']:
-            membership = Membership.objects.filter(
-                group__slug_name=data['name_destination'], 
-                user=self.context['user'], is_active=True)
-
-            if membership.exists():
-                pass
-            else:
-                raise serializers.ValidationError(
-                    'You do not belong to this group.')
+        self.resolve_destination(data)
 
         # Si es un repost, NO permite que se publique con los campos incluidos en fields
         if 'post' in self.context.keys():
-            fields = ['pictures', 'videos', 'feeling', 'location', 'tag_friends']
+            fields = ['pictures', 'videos', 'uploads', 'feeling', 'location', 'tag_friends']
             for i in self.context['request'].data.keys():
                 if i in fields:
                     raise serializers.ValidationError(
@@ -120,7 +236,7 @@ class PostModelSerializer(SharedPostModelSerializer):
             return data
         else:
             # De lo contrario, verifica que venga al menos un campo de media
-            media = ['about', 'pictures', 'videos']
+            media = ['about', 'pictures', 'videos', 'uploads']
             match = False
             for i in media:
                 if i in self.context['request'].data.keys():
@@ -131,6 +247,77 @@ class PostModelSerializer(SharedPostModelSerializer):
                     'You must include an about, picture or video.')
             return data
 
+    def resolve_destination(self, data):
+        """
+        Set the group, page or friend the post is published to. An
+        update that keeps the destination keeps its targets.
+        """
+        instance = self.instance
+        destination = data.get('destination', getattr(instance, 'destination', 'BIOGRAPHY'))
+        name_destination = data.get(
+            'name_destination', getattr(instance, 'name_destination', ''))
+        if (instance is not None
+                and destination == instance.destination
+                and name_destination == instance.name_destination):
+            return
+
+        data.update(group=None, page=None, target_user=None)
+        if destination in ['GROUP']:
+            membership = Membership.objects.filter(
+                group__slug_name=name_destination,
+                user=self.context['request'].user, is_active=True).select_related('group').first()
+
+            if membership is None:
+                raise serializers.ValidationError(
+                    'You do not belong to this group.')
+            data['group'] = membership.group
+
+        elif destination in ['FRIEND']:
+            try:
+                data['target_user'] = User.objects.get(username=name_destination)
+            except User.DoesNotExist:
+                raise serializers.ValidationError(
+                    f'The user with username {name_destination} does not exist.')
+
+        elif destination in ['PAGE']:
+            raise serializers.ValidationError(
+                'Page posts are published from the page.')
+
+    def add_media(self, post, uploads=()):
+        """
+        Save the uploaded pictures and videos of the post, one insert
+        each, and send them to the media pipeline. Their files are
+        stored by content. The finalized uploads become videos of the
+        post and are deleted, their videos keep the reference. A
+        failure rolls back the references taken on the stored files.
+        """
+        try:
+            pictures = self.context['request'].data.getlist('pictures')
+            videos = self.context['request'].data.getlist('videos')
+        except AttributeError:
+            pictures, videos = [], []
+
+        with transaction.atomic():
+            # Guardados por contenido, un archivo repetido no se escribe de nuevo
+            picture_field = Picture._meta.get_field('content')
+            video_field = Video._meta.get_field('content')
+            pictures = Picture.objects.bulk_create([
+                Picture(content=store(image, picture_field)) for image in pictures])
+            videos = [Video(content=store(video, video_field)) for video in videos]
+
+            # Locked so a concurrent post can not publish the same upload
+            finished = list(Upload.objects.select_for_update().filter(
+                pk__in=uploads, user=post.user, content__gt='').order_by('pk'))
+            videos += [Video(content=upload.content.name) for upload in finished]
+            videos = Video.objects.bulk_create(videos)
+            Upload.objects.filter(pk__in=[upload.pk for upload in finished]).delete()
+
+            post.pictures.add(*pictures)
+            post.videos.add(*videos)
+        if pictures or videos:
+            process_media.delay(
+                [picture.pk for picture in pictures], [video.pk for video in videos])
+
     def create(self, data):
         """Create a post."""
         user = self.context['user']
@@ -150,23 +337,11 @@ class PostModelSerializer(SharedPostModelSerializer):
                 user=user, post=re_post, about=data['about'])
 
             # Repost
-            re_post.shares += 1
-            re_post.save()
+            increment(re_post, 'shares')
         else:
+            uploads = data.pop('uploads', [])
             post = Post.objects.create(**data, user=user, profile=profile)
-            try:
-                videos = self.context['request'].data.getlist('videos')
-                pictures = self.context['request'].data.getlist('pictures')
-                
-                for image in pictures:
-                    picture = Picture.objects.create(content=image)
-                    post.pictures.add(picture)
-                
-                for i in videos:
-                    video = Video.objects.create(content=i)
-                    post.videos.add(video)
-            except AttributeError:
-                post.save()
+            self.add_media(post, uploads)
 
         # Add friends_except or specific_friends in the privacy configuration
         if 'privacy' in data.keys():
@@ -191,10 +366,9 @@ class PostModelSerializer(SharedPostModelSerializer):
         if user != post.user:
             type = 'Post'
             if post.destination in ['friend']:
-                friend_destination = User.objects.get(
-                    username=post.name_destination)
                 create_notification.delay(
-                    user.pk, friend_destination.pk, post.pk, type)
+                    user.pk, post.target_user_id, post.pk, type)
+        fan_out_post.delay(post.pk)
         return post
 
 
@@ -222,25 +396,16 @@ class CreatePagePostModelSerializer(PostModelSerializer):
         """Create a post."""
         user = self.context['user']
         profile = user.profile
+        uploads = data.pop('uploads', [])
         post = Post.objects.create(
             **data, user=user,
             profile=profile,
             privacy=self.context['privacy'],
             destination=self.context['destination'],
-            name_destination=self.context['name_destination'])
-        try:
-            videos = self.context['request'].data.getlist('videos')
-            pictures = self.context['request'].data.getlist('pictures')
-                
-            for image in pictures:
-                picture = Picture.objects.create(content=image)
-                post.pictures.add(picture)
-                
-            for i in videos:
-                video = Video.objects.create(content=i)
-                post.videos.add(video)
-        except AttributeError:
-            post.save()
+            name_destination=self.context['name_destination'],
+            page=self.context['page'])
+        self.add_media(post, uploads)
+        fan_out_post.delay(post.pk)
         return post
 
 
@@ -13,6 +13,9 @@ from app.users.serializers import UserModelSummarySerializer
 # Tasks
 from taskapp.tasks.notifications import create_notification
 
+# Utilities
+from app.posts.counters import toggle_reaction
+
 
 class ReactionPostModelSerializer(serializers.ModelSerializer):
     """Reaction post model serializer."""
@@ -31,39 +34,28 @@ class ReactionPostModelSerializer(serializers.ModelSerializer):
             'user', 'post'
         ]
 
-    def validate(self, data):
-        """verify that the user's reaction does not exist yet."""
-        try:
-            user = self.context['user']
-            reaction = ReactionPost.objects.get(user=user)
-
-            # Si la reaccion del usuario existe, esta se elimina
-            reaction.delete()
-            post = self.context['post']
-            post.reactions -= 1
-            post.save()
-        except ReactionPost.DoesNotExist:
-            # Si no existe, procede a crearse
-            return data
-
-    def create(self, data):
-        """Create a reaction post."""
-        # Reaction post
+    def toggle(self):
+        """
+        Add, change or remove the user's reaction to the post.
+        The same reaction removes it, another one replaces it.
+        """
         user = self.context['user']
         post = self.context['post']
-        reaction_post = ReactionPost.objects.create(
-            **data, user=user, profile=user.profile, post=post)
-        reaction_post.save()
-
-        # Post
-        post.reactions += 1
-        post.save()
-
-        if user != post.user:
+        reaction = self.validated_data['reaction']
+        result = toggle_reaction(ReactionPost, user, post, reaction)
+
+        if result.pk is not None:
+            self.instance = ReactionPost(
+                pk=result.pk, user=user, profile=user.profile,
+                post=post, reaction=reaction)
+        elif not result.removed:
+            # Otra peticion del usuario creo la reaccion primero
+            self.instance = ReactionPost.objects.get(user=user, post=post)
+
+        if result.old is None and result.pk is not None and user != post.user:
             type = 'Reaction Post'
-            create_notification.delay(
-                reaction_post.user.pk, post.user.pk, type, post.pk)
-        return reaction_post
+            create_notification.delay(user.pk, post.user_id, type, post.pk)
+        return result
 
 
 class ReactionPostModelSummarySerializer(ReactionPostModelSerializer):
@@ -98,39 +90,28 @@ class ReactionCommentModelSerializer(serializers.ModelSerializer):
             'user', 'comment'
         ]
 
-    def validate(self, data):
-        """Verify that the user's reaction does not exist yet."""
-        try:
-            user = self.context['user']
-            reaction = ReactionComment.objects.get(
-                user=user
-            )
-            # Si la reaccion del usuario existe, esta se elimina
-            reaction.delete()
-            comment = self.context['comment']
-            comment.reactions -= 1
-            comment.save()
-        except ReactionComment.DoesNotExist:
-            # Si no existe, procede a crearse
-            return data
-
-    def create(self, data):
-        """Create a reaction comment."""
-        # Reaction comment
+    def toggle(self):
+        """
+        Add, change or remove the user's reaction to the comment.
+        The same reaction removes it, another one replaces it.
+        """
         user = self.context['user']
         comment = self.context['comment']
-        reaction_comment = ReactionComment.objects.create(
-            **data, user=user, profile=user.profile, comment=comment)
-        reaction_comment.save()
-
-        # Comment
-        comment.reactions += 1
-        comment.save()
-        if user != comment.user:
+        reaction = self.validated_data['reaction']
+        result = toggle_reaction(ReactionComment, user, comment, reaction)
+
+        if result.pk is not None:
+            self.instance = ReactionComment(
+                pk=result.pk, user=user, profile=user.profile,
+                comment=comment, reaction=reaction)
+        elif not result.removed:
+            # Otra peticion del usuario creo la reaccion primero
+            self.instance = ReactionComment.objects.get(user=user, comment=comment)
+
+        if result.old is None and result.pk is not None and user != comment.user:
             type = 'Reaction Comment'
-            create_notification.delay(
-                reaction_comment.user.pk, comment.user.pk, type, comment.pk)
-        return reaction_comment
+            create_notification.delay(user.pk, comment.user_id, type, comment.pk)
+        return result
 
 
 class ReactionCommentModelSummarySerializer(ReactionCommentModelSerializer):
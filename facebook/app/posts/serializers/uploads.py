@@ -0,0 +1,47 @@
+"""Uploads serializers."""
+
+# Utilities
+import mimetypes
+import os
+
+# Django
+from django.conf import settings
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from app.posts.models import Upload
+
+
+class UploadModelSerializer(serializers.ModelSerializer):
+    """
+    Upload model serializer.
+    Declare a video upload, the offset tells the client where to
+    resume and the content is set once it was finalized.
+    """
+
+    content = serializers.FileField(read_only=True)
+
+    class Meta:
+        """Meta options."""
+        model = Upload
+        fields = ['id', 'filename', 'size', 'offset', 'content', 'created']
+        read_only_fields = ['id', 'offset', 'content', 'created']
+
+    def validate_filename(self, filename):
+        """Verify that the file is a video and keep only its name."""
+        filename = os.path.basename(filename)
+        content_type = mimetypes.guess_type(filename)[0] or ''
+        if not content_type.startswith('video/'):
+            raise serializers.ValidationError('Only videos can be uploaded in chunks.')
+        return filename
+
+    def validate_size(self, size):
+        """Verify that the video is not empty nor too large."""
+        if size == 0:
+            raise serializers.ValidationError('The file is empty.')
+        if size > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'The file can not be larger than {settings.UPLOAD_MAX_SIZE} bytes.')
+        return size
@@ -0,0 +1,162 @@
+"""Content-addressed media storage."""
+
+# Utilities
+import os
+from hashlib import sha256
+
+# Django
+from django.core.files import File
+from django.db import models, transaction
+from django.http import UnreadablePostError
+
+# Models
+from app.posts.models import MediaBlob
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StagedFile(File):
+    """A file of the staging directory, the storage moves it instead of copying it."""
+
+    def temporary_file_path(self):
+        """Return the path of the staging file."""
+        return self.file.name
+
+
+def get_digest(file):
+    """Return the hex SHA-256 of the file, read again only if it was not hashed on upload."""
+    digest = getattr(file, 'content_hash', None)
+    if digest is None:
+        hasher = sha256()
+        for chunk in file.chunks():
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+    return digest
+
+
+def content_name(directory, digest, extension):
+    """
+    Return the name of a content in the directory, sharded by the
+    first bytes of the digest so no directory grows too large:
+    directory/ab/cd/abcd...ef.jpg
+    """
+    return '{}/{}/{}/{}{}'.format(
+        directory.rstrip('/'), digest[:2], digest[2:4], digest, extension.lower())
+
+
+def store(file, field, extension=None):
+    """
+    Store the file in the upload directory of the file field and
+    return its name. The name is the digest of the content, so a file
+    already stored is not written again, it only gets one more
+    reference.
+    extension: of the stored name, the one of the file name by default.
+    """
+    if extension is None:
+        extension = os.path.splitext(file.name or '')[1]
+    name = content_name(field.upload_to, get_digest(file), extension)
+
+    with transaction.atomic():
+        # The row lock orders this write after the release of the last reference
+        MediaBlob.objects.acquire(name, file.size)
+        if not field.storage.exists(name):
+            saved = field.storage.save(name, file)
+            if saved != name:
+                # Written meanwhile outside of the blobs, keep that one
+                field.storage.delete(saved)
+    return name
+
+
+def share(files):
+    """
+    Add a reference to every stored file, or to none of them if one
+    is already gone. Return whether the references were added.
+    """
+    with transaction.atomic():
+        for file in files:
+            MediaBlob.objects.acquire(file.name)
+        if all(file.storage.exists(file.name) for file in files):
+            return True
+        transaction.set_rollback(True)
+    return False
+
+
+def release(file):
+    """Remove a reference to a stored file, deleting it with the last one."""
+    if not file:
+        return
+    with transaction.atomic():
+        left = MediaBlob.objects.release(file.name)
+        # Sin fila es un archivo anterior a los blobs, con un solo dueño
+        if not left:
+            file.storage.delete(file.name)
+
+
+def delete_media(queryset):
+    """Delete the media of the queryset and release all of their files."""
+    fields = [
+        field.name for field in queryset.model._meta.get_fields()
+        if isinstance(field, models.FileField)]
+    for media in queryset:
+        for name in fields:
+            release(getattr(media, name))
+        media.delete()
+
+
+def write_chunk(path, offset, stream, length):
+    """
+    Write up to length bytes of the stream in the file at the offset
+    and return how many were written. What arrived before a dropped
+    connection is kept and synced, so the upload resumes after it.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    # Sin O_TRUNC: un fragmento reenviado sobrescribe, no borra el resto
+    with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600), 'wb') as file:
+        file.seek(offset)
+        try:
+            while written < length:
+                chunk = stream.read(min(CHUNK_SIZE, length - written))
+                if not chunk:
+                    break
+                file.write(chunk)
+                written += len(chunk)
+        except UnreadablePostError:
+            pass
+        file.flush()
+        os.fsync(file.fileno())
+    return written
+
+
+def finalize_upload(upload):
+    """
+    Store the received file of a complete upload by content and set
+    it as the content of the upload. The staging file is moved, or
+    dropped when the content was already stored.
+    """
+    path = upload.staging_path
+    with StagedFile(open(path, 'rb'), name=upload.filename) as file:
+        upload.content = store(file, upload._meta.get_field('content'))
+    if os.path.exists(path):
+        os.remove(path)
+    upload.save()
+
+
+def discard_upload(upload):
+    """
+    Delete an upload with its staging file or the reference to its
+    content. An upload locked by a post publishing it, or by a chunk
+    being written, is skipped. Return whether it was deleted.
+    """
+    with transaction.atomic():
+        upload = type(upload).objects.select_for_update(skip_locked=True).filter(
+            pk=upload.pk).first()
+        if upload is None:
+            return False
+        if upload.is_finished:
+            release(upload.content)
+        elif os.path.exists(upload.staging_path):
+            os.remove(upload.staging_path)
+        upload.delete()
+    return True
@@ -1,3 +1,160 @@
-from django.test import TestCase
+"""Posts tests."""
 
-# Create your tests here.
+# Utilities
+from unittest import mock, skipUnless
+
+# Django
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Models
+from app.posts.models import Picture, Post, Video
+from app.users.models import Profile, User
+
+# Serializers
+from app.posts.serializers import PostModelSerializer
+
+# Utilities
+from app.posts.buffers import LocalCounterBuffer, get_counter_buffer
+from app.posts.counters import FLUSH_LOCK_KEY, flush_counter_buffer, increment
+from app.posts.plans import analyze, get_hot_queries, get_seq_scans, seed_dataset
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    POST_COUNTER_BUFFER=None)
+class PostSerializerQueriesTestCase(TestCase):
+    """Post serializer query plan test case."""
+
+    def setUp(self):
+        """Create posts with media, tagged friends and reposts."""
+        # The buffer of the settings is built once per process
+        get_counter_buffer.cache_clear()
+        self.addCleanup(get_counter_buffer.cache_clear)
+        users = [
+            User.objects.create_user(
+                email=f'user{i}@example.com', username=f'user{i}',
+                password='secretpass123', first_name='user', last_name=str(i))
+            for i in range(3)]
+        for user in users:
+            Profile.objects.create(user=user)
+        user, friend, other = users
+
+        for i in range(50):
+            post = Post.objects.create(
+                user=user, profile=user.profile, about=f'post {i}',
+                privacy='PUBLIC', destination='BIOGRAPHY')
+            post.pictures.add(Picture.objects.create(content=f'posts/pictures/{i}.jpg'))
+            post.videos.add(Video.objects.create(content=f'posts/videos/{i}.mp4'))
+            post.tag_friends.add(friend, other)
+            Post.objects.create(
+                user=friend, profile=friend.profile, about=f'share {i}',
+                privacy='PUBLIC', destination='BIOGRAPHY', re_post=post)
+
+    def count_queries(self, size):
+        """Return the queries made to serialize a page of reposts."""
+        queryset = PostModelSerializer.setup_eager_loading(
+            Post.objects.filter(re_post__isnull=False))
+        with CaptureQueriesContext(connection) as context:
+            data = PostModelSerializer(queryset[:size], many=True).data
+        self.assertEqual(len(data), size)
+        return len(context.captured_queries)
+
+    def test_constant_queries(self):
+        """The queries of a page do not depend on its size."""
+        self.assertEqual(self.count_queries(5), self.count_queries(50))
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CounterBufferTestCase(TestCase):
+    """Local counter buffer test case."""
+
+    def setUp(self):
+        """Create a hot post and a local counter buffer."""
+        user = User.objects.create_user(
+            email='user@example.com', username='user', password='secretpass123',
+            first_name='user', last_name='user')
+        profile = Profile.objects.create(user=user)
+        self.post = Post.objects.create(
+            user=user, profile=profile, privacy='PUBLIC',
+            destination='BIOGRAPHY', sharded_counters=True)
+        self.buffer = LocalCounterBuffer()
+        patcher = mock.patch(
+            'app.posts.counters.get_counter_buffer', return_value=self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_pending(self):
+        """Return the deltas of the post not yet in its row."""
+        post = Post.objects.get(pk=self.post.pk)
+        return self.buffer.get_pending([(post.pk, post.counter_epoch)])[post.pk]
+
+    def test_add_and_read(self):
+        """The increments of a hot post wait in the buffer."""
+        increment(self.post, 'reactions')
+        increment(self.post, 'reactions')
+        increment(self.post, 'shares', 3)
+        self.assertEqual(self.get_pending(), {'reactions': 2, 'shares': 3})
+        self.assertEqual(Post.objects.get(pk=self.post.pk).reactions, 0)
+
+    def test_flush(self):
+        """A flush writes the deltas into the row once."""
+        increment(self.post, 'comments', 4)
+        self.assertEqual(flush_counter_buffer(), 1)
+
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.comments, 4)
+        self.assertEqual(post.counter_epoch, 1)
+        # Lo que quedo en vuelo ya esta en la fila
+        self.assertEqual(self.get_pending(), {})
+
+    def test_read_before_flush_written(self):
+        """A row read before the flush was written adds the in-flight deltas."""
+        increment(self.post, 'comments', 2)
+        self.buffer.begin_flush()
+        self.assertEqual(
+            self.buffer.get_pending([(self.post.pk, 0)])[self.post.pk], {'comments': 2})
+
+    def test_failed_flush(self):
+        """A failed flush keeps the deltas once for the next flush."""
+        increment(self.post, 'reactions', 5)
+        with mock.patch.object(Post.objects, 'filter', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                flush_counter_buffer()
+        self.assertEqual(self.get_pending(), {'reactions': 5})
+
+        flush_counter_buffer()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).reactions, 5)
+        self.assertEqual(self.get_pending(), {})
+
+    def test_overlapping_flush(self):
+        """A flush started while another one runs is skipped."""
+        increment(self.post, 'shares', 2)
+        cache.add(FLUSH_LOCK_KEY, 1)
+        self.assertEqual(flush_counter_buffer(), 0)
+        self.assertEqual(self.buffer.epoch, 0)
+
+        cache.delete(FLUSH_LOCK_KEY)
+        self.assertEqual(flush_counter_buffer(), 1)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).shares, 2)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'The query plans are only checked on PostgreSQL.')
+class QueryPlansTestCase(TestCase):
+    """Hot query plans test case."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a dataset large enough for the planner to prefer the indexes."""
+        cls.data = seed_dataset(10000)
+        analyze()
+
+    def test_no_sequential_scans(self):
+        """The hot queries of the API are served by indexes."""
+        for name, queryset in get_hot_queries(self.data):
+            with self.subTest(query=name):
+                _, scans = get_seq_scans(queryset)
+                self.assertEqual(scans, [], f'{name} falls back to a sequential scan')
@@ -7,7 +7,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 # Views
-from .views import (CommentViewSet, PostViewSet,
+from .views import (CommentViewSet, PostViewSet, UploadViewSet,
                     create_category, retrieve_category, 
                     retrieve_saved, list_saved)
 
@@ -18,6 +18,8 @@ router.register(r'posts', PostViewSet, basename='posts')
 router.register(r'posts/(?P<id>[0-9]+)/comments',
                 CommentViewSet, basename='comments')
 
+router.register(r'uploads', UploadViewSet, basename='uploads')
+
 urlpatterns = [
     path('posts/collections/', create_category),
     path('posts/collections/<int:pk>/', retrieve_category),
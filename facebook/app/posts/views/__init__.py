@@ -1,3 +1,4 @@
 from .comments import *
 from .posts import *
-from .saved import *
\ No newline at end of file
+from .saved import *
+from .uploads import *
\ No newline at end of file
@@ -1,5 +1,8 @@
 """Comments views."""
 
+# Django
+from django.conf import settings
+
 # Django REST framework
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
@@ -13,11 +16,18 @@ from app.posts.permissions import IsCommentOwner, IsCommentOrPostOwner, IsFriend
 # Models
 from app.posts.models import Comment, Post, ReactionComment
 
+# Pagination
+from app.posts.pagination import RepliesCursorPagination
+
 # Serializers
 from app.posts.serializers import (CommentModelSerializer,
                                    ReactionCommentModelSerializer,
                                    ReactionCommentModelSummarySerializer)
 
+# Utilities
+from app.posts.counters import get_reaction_summary, increment
+from app.utils.responses import invalidate_post_responses
+
 
 class CommentViewSet(mixins.CreateModelMixin,
                      mixins.ListModelMixin,
@@ -40,10 +50,13 @@ class CommentViewSet(mixins.CreateModelMixin,
         return super(CommentViewSet, self).dispatch(request, *args, **kwargs)
 
     def perform_destroy(self, instance):
-        """Delete a comment and subtract -1 from comments on the post."""
-        self.object.comments -= 1
-        self.object.save()
+        """Delete a comment with its replies and update the counters."""
+        thread = Comment.objects.filter(path__startswith=instance.path).count()
+        increment(self.object, 'comments', -thread)
+        if instance.parent_id is not None:
+            increment(instance.parent, 'replies', -1)
         instance.delete()
+        invalidate_post_responses(self.object)
     
     def get_queryset(self):
         """Return post's comments."""
@@ -52,7 +65,8 @@ class CommentViewSet(mixins.CreateModelMixin,
 
     def get_permissions(self):
         """Assign permissions based on action."""
-        if self.action in ['create', 'retrieve', 'react', 'reactions']:
+        if self.action in [
+            'create', 'retrieve', 'replies', 'react', 'reactions', 'all_reactions']:
             permissions = [IsAuthenticated, IsFriendPostOwner]
         elif self.action in ['update', 'partial_update']:
            permissions = [IsAuthenticated, IsCommentOwner]
@@ -68,33 +82,30 @@ class CommentViewSet(mixins.CreateModelMixin,
             data=request.data, context={'user': request.user, 'post': self.object})
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_post_responses(self.object)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def list(self, request, *args, **kwargs):
-        """Restrict comments according to post privacy."""
-        user = request.user
-        friends = self.object.profile.friends.all()
-
-        if self.object.privacy == 'PUBLIC':
-            pass
-        elif self.object.privacy == 'FRIENDS':
-            if user in friends or user == self.object.user:
-                pass
-            else:
-                data = {'message': 'Content not available.'}
-                return Response(data, status=status.HTTP_403_FORBIDDEN)
-        elif self.object.privacy in ['SPECIFIC_FRIENDS', 'FRIENDS_EXC']:
-            if (user in self.object.specific_friends.all() 
-                or user not in self.object.friends_exc.all() 
-                or user == self.object.user):
-                pass
-            else:
-                data = {'message': 'Content not available.'}
-                return Response(data, status=status.HTTP_403_FORBIDDEN)
+        """List the top level comments, restricted by the post privacy."""
+        if not self.object.is_visible_to(request.user):
+            data = {'message': 'Content not available.'}
+            return Response(data, status=status.HTTP_403_FORBIDDEN)
 
-        comments = Comment.objects.filter(post=self.object)
-        data = CommentModelSerializer(comments, many=True).data
-        return Response(data, status=status.HTTP_200_OK)
+        comments = Comment.objects.filter(
+            post=self.object, parent__isnull=True).select_related('user')
+        page = self.paginate_queryset(comments)
+        data = CommentModelSerializer(page, many=True).data
+        return self.get_paginated_response(data)
+
+    @action(detail=True, methods=['get'])
+    def replies(self, request, *args, **kwargs):
+        """List the replies of a comment, oldest first."""
+        comment = self.get_object()
+        replies = Comment.objects.filter(parent=comment).select_related('user')
+        paginator = RepliesCursorPagination()
+        page = paginator.paginate_queryset(replies, request, view=self)
+        data = CommentModelSerializer(page, many=True).data
+        return paginator.get_paginated_response(data)
 
     @action(detail=True, methods=['post'])
     def react(self, request, *args, **kwargs):
@@ -102,20 +113,38 @@ class CommentViewSet(mixins.CreateModelMixin,
         comment = self.get_object()
         serializer = ReactionCommentModelSerializer(
             data=request.data, context={'user': request.user, 'comment': comment})
-            
-        try:
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        except AssertionError:
+        serializer.is_valid(raise_exception=True)
+        result = serializer.toggle()
+
+        if result.removed:
             return Response(
                 {'message': "The comment's reaction has been delete."}, status=status.HTTP_200_OK)
+        if result.old is None:
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_200_OK)
     
     @action(detail=True, methods=['get'])
     def reactions(self, request, *args, **kwargs):
-        """List all comment's reactions."""
+        """Return the reaction counts of the comment by type and the last reactors."""
         comment = self.get_object()
-        reactions = ReactionComment.objects.filter(comment=comment)
-        serializer = ReactionCommentModelSummarySerializer(
-            reactions, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        summary = get_reaction_summary(comment)
+        top = ReactionComment.objects.filter(comment=comment).select_related(
+            'user__profile').order_by('-created', '-id')[:settings.REACTIONS_TOP]
+        data = {
+            'total': sum(summary.values()),
+            'summary': summary,
+            'top': ReactionCommentModelSummarySerializer(top, many=True).data
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'])
+    def all_reactions(self, request, *args, **kwargs):
+        """List all comment's reactions, optionally of one ?reaction= type."""
+        comment = self.get_object()
+        reactions = ReactionComment.objects.filter(
+            comment=comment).select_related('user__profile')
+        if 'reaction' in request.query_params:
+            reactions = reactions.filter(reaction=request.query_params['reaction'])
+        page = self.paginate_queryset(reactions)
+        serializer = ReactionCommentModelSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -1,7 +1,7 @@
 """Posts views."""
 
 # Django
-from django.db.models import Q
+from django.conf import settings
 
 # Django REST framework
 from rest_framework import mixins, status, viewsets
@@ -9,11 +9,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 # Permissions
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from app.posts.permissions import IsFriend, IsPostOwner
 
 # Models
-from app.posts.models import CategorySaved, Post, ReactionPost, Saved, Shared
+from app.posts.models import (CategorySaved, Post,
+                              ReactionPost, Saved, Shared)
+
+# Pagination
+from app.posts.pagination import FeedCursorPagination, RankedFeedPagination
 
 # Serializers
 from app.posts.serializers import (PostModelSerializer,
@@ -22,8 +26,19 @@ from app.posts.serializers import (PostModelSerializer,
                                    SavedPostModelSerializer,
                                    SharedModelSerializer)
 
+# Tasks
+from taskapp.tasks.media import delete_orphan_media
+from taskapp.tasks.posts import fan_out_post
+
+# Utilities
+from app.posts.counters import get_reaction_summary
+from app.posts.renders import get_stats, render_states
+from app.utils.conditional import ConditionalMixin
+from app.utils.responses import invalidate_post_responses
+
 
-class PostViewSet(mixins.CreateModelMixin,
+class PostViewSet(ConditionalMixin,
+                  mixins.CreateModelMixin,
                   mixins.ListModelMixin,
                   mixins.RetrieveModelMixin,
                   mixins.UpdateModelMixin,
@@ -36,27 +51,30 @@ class PostViewSet(mixins.CreateModelMixin,
     list post's reactions and post saving.
     """
 
+    queryset = Post.objects.all()
     serializer_class = PostModelSerializer
 
     def get_queryset(self):
-        """Restrict list to public or friend's posts."""
-        queryset = Post.objects.all()
-        user = self.request.user
-        friends = user.profile.friends.all()
-        if self.action == 'list':
-            queryset = Post.objects.filter(
-                Q(user=user) | Q(privacy='PUBLIC') | Q(user__in=friends, privacy='FRIENDS') 
-                | Q(user__in=friends, privacy='SPECIFIC_FRIENDS', specific_friends__in=[user])
-                | Q(specific_friends__in=[user])).exclude(Q(friends_exc__in=[user]))
+        """Load the relations of the post to be retrieved."""
+        queryset = super(PostViewSet, self).get_queryset()
+        if self.action == 'retrieve':
+            return PostModelSerializer.setup_eager_loading(queryset)
         return queryset
 
+    def get_conditional_rows(self, queryset):
+        """Return the render states of the posts."""
+        return render_states(queryset)
+
     def get_permissions(self):
         """Assign permissions based on action."""
         if self.action in [
-            'retrieve', 'react', 'reactions', 'share', 'post_shares', 'saved']:
+            'retrieve', 'react', 'reactions', 'all_reactions',
+            'share', 'post_shares', 'saved']:
             permissions = [IsFriend]
         elif self.action in ['update', 'partial_update', 'destroy']:
            permissions = [IsAuthenticated, IsPostOwner]
+        elif self.action in ['render_stats']:
+            permissions = [IsAdminUser]
         else:
             permissions = [IsAuthenticated]
         return[p() for p in permissions]
@@ -69,27 +87,90 @@ class PostViewSet(mixins.CreateModelMixin,
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    def perform_update(self, serializer):
+        """Update a post and refresh the feeds that show it."""
+        post = serializer.save()
+        fan_out_post.delay(post.pk)
+        invalidate_post_responses(post)
+
+    def perform_destroy(self, instance):
+        """
+        Delete a post, its media when no other post shows them and
+        the cached pages that list it.
+        """
+        picture_pks = list(instance.pictures.values_list('pk', flat=True))
+        video_pks = list(instance.videos.values_list('pk', flat=True))
+        instance.delete()
+        if picture_pks or video_pks:
+            delete_orphan_media.delay(picture_pks, video_pks)
+        invalidate_post_responses(instance)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the home feed of the requesting user,
+        newest first or ranked with ?ranking=top.
+        """
+        queryset = PostModelSerializer.setup_eager_loading(Post.objects.all())
+        if request.query_params.get('ranking') == 'top':
+            paginator = RankedFeedPagination()
+        else:
+            paginator = FeedCursorPagination()
+
+        pks = paginator.get_feed_window(request)
+        states = {state[0]: state for state in render_states(Post.objects.filter(pk__in=pks))}
+        response = self.check_not_modified([states[pk] for pk in pks if pk in states])
+        if response is not None:
+            return response
+
+        posts = paginator.paginate_feed(queryset, request)
+        data = PostModelSerializer(posts, many=True).data
+        return paginator.get_paginated_response(data)
+
+    @action(detail=False, methods=['get'])
+    def render_stats(self, request, *args, **kwargs):
+        """Return the hit ratio and bytes saved by the render cache."""
+        return Response(get_stats(), status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['post'])
     def react(self, request, *args, **kwargs):
         """Handles post's reaction."""
         post = self.get_object()
         serializer = ReactionPostModelSerializer(
             data=request.data, context={'user': request.user, 'post': post})
-            
-        try:
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        except AssertionError:
+        serializer.is_valid(raise_exception=True)
+        result = serializer.toggle()
+        invalidate_post_responses(post)
+
+        if result.removed:
             return Response({'message': 'The reaction has been delete.'}, status=status.HTTP_200_OK)
+        if result.old is None:
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'])
     def reactions(self, request, *args, **kwargs):
-        """List all post's reactions."""
+        """Return the reaction counts of the post by type and the last reactors."""
         post = self.get_object()
-        reactions = ReactionPost.objects.filter(post=post)
-        serializer = ReactionPostModelSummarySerializer(reactions, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        summary = get_reaction_summary(post)
+        top = ReactionPost.objects.filter(post=post).select_related(
+            'user').order_by('-created', '-id')[:settings.REACTIONS_TOP]
+        data = {
+            'total': sum(summary.values()),
+            'summary': summary,
+            'top': ReactionPostModelSummarySerializer(top, many=True).data
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'])
+    def all_reactions(self, request, *args, **kwargs):
+        """List all post's reactions, optionally of one ?reaction= type."""
+        post = self.get_object()
+        reactions = ReactionPost.objects.filter(post=post).select_related('user')
+        if 'reaction' in request.query_params:
+            reactions = reactions.filter(reaction=request.query_params['reaction'])
+        page = self.paginate_queryset(reactions)
+        serializer = ReactionPostModelSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def share(self, request, *args, **kwargs):
@@ -99,6 +180,7 @@ class PostViewSet(mixins.CreateModelMixin,
             data=request.data, context={'user': request.user, 'post': post, 'request': request})
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_post_responses(post)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['get'])
@@ -106,8 +188,9 @@ class PostViewSet(mixins.CreateModelMixin,
         """Handles list shares of a post."""
         post = self.get_object()
         shares = Shared.objects.filter(post=post)
-        serializer = SharedModelSerializer(shares, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(shares)
+        serializer = SharedModelSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def saved(self, request, *args, **kwargs):
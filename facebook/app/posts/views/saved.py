@@ -12,8 +12,12 @@ from app.posts.permissions import IsSavedOwner
 # Models
 from app.posts.models import CategorySaved, Saved
 
+# Pagination
+from app.utils.pagination import FbCursorPagination
+
 # Serializers
 from app.posts.serializers import (CategorySavedModelSerializer,
+                                   PostModelSerializer,
                                    SavedPostModelSerializer)
 
 
@@ -83,6 +87,10 @@ def retrieve_saved(request, pk=None):
 @permission_classes([IsAuthenticated])
 def list_saved(request):
     """List all post saved of user."""
-    saved = Saved.objects.filter(user=request.user)
-    serializer = SavedPostModelSerializer(saved, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    saved = PostModelSerializer.setup_eager_loading(
+        Saved.objects.filter(user=request.user), prefix='post__')
+    saved = saved.select_related('user', 'saved_category')
+    paginator = FbCursorPagination()
+    page = paginator.paginate_queryset(saved, request)
+    serializer = SavedPostModelSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,121 @@
+"""Uploads views."""
+
+# Django
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+# Django REST framework
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+# Permissions
+from rest_framework.permissions import IsAuthenticated
+
+# Models
+from app.posts.models import Upload
+
+# Serializers
+from app.posts.serializers import UploadModelSerializer
+
+# Utilities
+from app.posts.storage import discard_upload, finalize_upload, write_chunk
+
+
+class UploadViewSet(mixins.CreateModelMixin,
+                    mixins.RetrieveModelMixin,
+                    mixins.DestroyModelMixin,
+                    viewsets.GenericViewSet):
+    """
+    Upload view set.
+    Handle resumable video uploads: declare the upload, send the
+    chunks with PATCH at the Upload-Offset header, ask the offset with
+    HEAD or GET after a dropped connection, finalize it and reference
+    its id in the uploads of a post.
+    """
+
+    serializer_class = UploadModelSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Return the uploads of the requesting user."""
+        return Upload.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        """Declare an upload of the requesting user."""
+        serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        """Cancel an upload, or drop a finalized one not used by a post."""
+        discard_upload(instance)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Add the offset of the upload to the response."""
+        response = super(UploadViewSet, self).finalize_response(
+            request, response, *args, **kwargs)
+        if isinstance(response.data, dict) and 'offset' in response.data:
+            response['Upload-Offset'] = response.data['offset']
+        return response
+
+    def conflict(self, detail, upload):
+        """Return a 409 response with the offset the client has to resume from."""
+        data = self.get_serializer(upload).data
+        data['detail'] = detail
+        return Response(data, status=status.HTTP_409_CONFLICT)
+
+    def partial_update(self, request, *args, **kwargs):
+        """
+        Append a chunk: the raw body is written at the Upload-Offset
+        header, which must be the offset received so far. The body is
+        streamed to the staging file, never loaded in memory.
+        """
+        try:
+            offset = int(request.META['HTTP_UPLOAD_OFFSET'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (KeyError, ValueError):
+            return Response(
+                {'detail': 'The Upload-Offset and Content-Length headers are required.'},
+                status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response(
+                {'detail': f'A chunk can not be larger than {settings.UPLOAD_CHUNK_MAX_SIZE} bytes.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        try:
+            with transaction.atomic():
+                # Un solo fragmento a la vez por subida
+                upload = get_object_or_404(
+                    self.get_queryset().select_for_update(nowait=True), pk=kwargs['pk'])
+
+                if upload.is_finished:
+                    return self.conflict('The upload is already finalized.', upload)
+                if offset != upload.offset:
+                    return self.conflict('The offset does not match the bytes received.', upload)
+                if offset + length > upload.size:
+                    return Response(
+                        {'detail': 'The chunk goes past the size of the upload.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+                if length:
+                    upload.offset += write_chunk(
+                        upload.staging_path, offset, request.stream, length)
+                    upload.save()
+        except OperationalError:
+            return Response(
+                {'detail': 'Another chunk of this upload is being written.'},
+                status=status.HTTP_409_CONFLICT)
+
+        return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, *args, **kwargs):
+        """Move a complete upload to the media storage."""
+        with transaction.atomic():
+            upload = get_object_or_404(
+                self.get_queryset().select_for_update(), pk=kwargs['pk'])
+            if not upload.is_finished:
+                if upload.offset != upload.size:
+                    return self.conflict('The upload is not complete.', upload)
+                finalize_upload(upload)
+        return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
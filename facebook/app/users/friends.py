@@ -0,0 +1,49 @@
+"""Friends cache."""
+
+# Utilities
+from array import array
+from bisect import bisect_left
+
+# Django
+from django.core.cache import cache
+
+# Models
+from app.users.models import Profile
+
+
+FRIENDS_KEY = 'users:friends:{}'
+FRIENDS_TIMEOUT = 60 * 60 * 24
+
+
+def get_pk(user):
+    """Return the pk of a user or the pk itself."""
+    return getattr(user, 'pk', user)
+
+
+def friends_of(user):
+    """
+    Return the pks of the friends of a user as a sorted array.
+    The array is read from the cache, on a miss it is loaded
+    with a single query on the friends table.
+    """
+    key = FRIENDS_KEY.format(get_pk(user))
+    friends = cache.get(key)
+    if friends is None:
+        friends = array('q', Profile.friends.through.objects.filter(
+            profile__user_id=get_pk(user)).order_by('user_id').values_list(
+                'user_id', flat=True))
+        cache.set(key, friends, FRIENDS_TIMEOUT)
+    return friends
+
+
+def is_friend(user1, user2):
+    """Return True if the users are friends."""
+    friends = friends_of(user1)
+    pk = get_pk(user2)
+    index = bisect_left(friends, pk)
+    return index < len(friends) and friends[index] == pk
+
+
+def invalidate_friends(*users):
+    """Drop the cached friends of the users."""
+    cache.delete_many([FRIENDS_KEY.format(get_pk(user)) for user in users])
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.5 on 2026-10-18 10:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='friendrequest',
+            options={'ordering': ['-created', '-modified']},
+        ),
+        migrations.AlterField(
+            model_name='friendrequest',
+            name='requesting_user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='friendrequest',
+            index=models.Index(condition=models.Q(('accepted', False)), fields=['requested_user', '-created', '-id'], name='friend_request_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='friendrequest',
+            index=models.Index(fields=['requesting_user', 'requested_user'], name='friend_request_pair_idx'),
+        ),
+    ]
@@ -10,7 +10,8 @@ from app.utils.models import FbModel
 class FriendRequest(FbModel):
     """Friend request."""
 
-    requesting_user = models.ForeignKey('users.User', on_delete=models.CASCADE)
+    requesting_user = models.ForeignKey(
+        'users.User', on_delete=models.CASCADE, db_index=False)
     
     requested_user = models.ForeignKey(
         'users.User', 
@@ -23,4 +24,18 @@ class FriendRequest(FbModel):
         """Return requesting_user and requested_user."""
         return 'from @{} to @{}'.format(
             self.requesting_user.username,
-            self.requested_user.username)
\ No newline at end of file
+            self.requested_user.username)
+
+    class Meta:
+        """Meta options."""
+        ordering = ['-created', '-modified']
+
+        indexes = [
+            models.Index(
+                fields=['requested_user', '-created', '-id'],
+                name='friend_request_pending_idx',
+                condition=models.Q(accepted=False)),
+            models.Index(
+                fields=['requesting_user', 'requested_user'],
+                name='friend_request_pair_idx')
+        ]
\ No newline at end of file
@@ -6,11 +6,15 @@ from rest_framework import serializers
 # Models
 from app.users.models import FriendRequest
 
+# Utilities
+from app.users.friends import invalidate_friends, is_friend
+
 # Serializers
 from .users import UserModelSummarySerializer
 
 # Tasks
 from taskapp.tasks.notifications import create_notification
+from taskapp.tasks.posts import refresh_feed_source
 
 
 class FriendRequestModelSerializer(serializers.ModelSerializer):
@@ -43,7 +47,7 @@ class FriendRequestModelSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "You can't send friend request to yourself.")
 
-        if requesting_user.profile in requested_user.friends.all():
+        if is_friend(requesting_user, requested_user):
             raise serializers.ValidationError(
                 f'You are already a friend of {requested_user.username}.')
         try:
@@ -106,6 +110,9 @@ class AcceptFriendRequestSerializer(serializers.Serializer):
 
         requesting_user.profile.save()
         requested_user.profile.save()
+        invalidate_friends(requesting_user, requested_user)
+        refresh_feed_source.delay(requesting_user.pk, author_pk=requested_user.pk)
+        refresh_feed_source.delay(requested_user.pk, author_pk=requesting_user.pk)
 
         type = 'Friend Accept'
         create_notification.delay(
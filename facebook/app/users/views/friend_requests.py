@@ -64,8 +64,9 @@ class FriendRequestViewSet(mixins.CreateModelMixin,
         if request.user == self.user:
             friend_requests = FriendRequest.objects.filter(
                 requested_user=request.user, accepted=False)
-            data = FriendRequestModelSerializer(friend_requests, many=True).data
-            return Response(data, status=status.HTTP_200_OK)
+            page = self.paginate_queryset(friend_requests)
+            data = FriendRequestModelSerializer(page, many=True).data
+            return self.get_paginated_response(data)
         else:
             data = {'message': 'You do not have permission for this action.'}
             return Response(data, status=status.HTTP_403_FORBIDDEN)
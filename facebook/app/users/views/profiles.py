@@ -22,8 +22,19 @@ from app.users.serializers import (ProfileDetailModelSerializer,
                                    ProfileModelSerializer,
                                    UserModelSummarySerializer)
 
+# Utilities
+from app.posts.feeds import invalidate_pulled_sources
+from app.posts.renders import render_states
+from app.users.friends import invalidate_friends, is_friend
+from app.utils.conditional import ConditionalMixin
+from app.utils.responses import cache_anonymous, invalidate_responses
 
-class ProfileViewSet(mixins.ListModelMixin,
+# Tasks
+from taskapp.tasks.posts import refresh_feed_source
+
+
+class ProfileViewSet(ConditionalMixin,
+                     mixins.ListModelMixin,
                      mixins.RetrieveModelMixin,
                      mixins.UpdateModelMixin,
                      viewsets.GenericViewSet):
@@ -37,6 +48,7 @@ class ProfileViewSet(mixins.ListModelMixin,
     queryset = Profile.objects.filter(user__is_verified=True)
     serializer_class = ProfileModelSerializer
     lookup_field = 'user__username'
+    conditional_fields = ('modified', 'profiledetail__modified')
 
     def get_permissions(self):
         """Assign permissions based on action."""
@@ -48,6 +60,16 @@ class ProfileViewSet(mixins.ListModelMixin,
             permissions = [IsAuthenticated]
         return[p() for p in permissions]
 
+    @cache_anonymous('profiles')
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a profile, anonymous requests are served from the cache."""
+        return super(ProfileViewSet, self).retrieve(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        """Update a profile and drop its cached responses."""
+        serializer.save()
+        invalidate_responses('profiles', self.kwargs['user__username'])
+
     @action(detail=True, methods=['put', 'patch'])
     def update_details(self, request, *args, **kwargs):
         """Update profile details."""
@@ -58,6 +80,7 @@ class ProfileViewSet(mixins.ListModelMixin,
             details, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_responses('profiles', profile.user.username)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'])
@@ -66,37 +89,32 @@ class ProfileViewSet(mixins.ListModelMixin,
         Restric according to the user requesting and privacy of posts.
         """
         profile = self.get_object()
-        friends = profile.friends.all()
-
-        if request.user.profile == profile:
-            posts = Post.objects.filter(
-                Q(profile=profile, destination='BIOGRAPHY')
-                | Q(destination='FRIEND', name_destination=profile.user.username))
-        elif request.user in friends:
-            posts = Post.objects.filter(
-                Q(profile=profile, destination='BIOGRAPHY', privacy='PUBLIC')
-                | Q(profile=profile, destination='BIOGRAPHY', privacy='FRIENDS')
-                | Q(profile=profile, destination='BIOGRAPHY', specific_friends__in=[request.user])
-                | Q(destination='FRIEND', name_destination=profile.user.username, privacy='FRIENDS')
-                | Q(destination='FRIEND', name_destination=profile.user.username, specific_friends__in=[request.user])
-                | Q(profile=profile, destination='BIOGRAPHY', privacy='FRIENDS_EXC')
-                | Q(destination='FRIEND', name_destination=profile.user.username, privacy='FRIENDS_EXC')
-            ).exclude(Q(friends_exc__in=[request.user]))
-        else:
-            posts = Post.objects.filter(
-                Q(profile=profile, destination='BIOGRAPHY', privacy='PUBLIC')
-                | Q(destination='FRIEND', name_destination=profile.user.username, privacy='PUBLIC'))
+        posts = Post.objects.filter(
+            Q(profile=profile, destination='BIOGRAPHY')
+            | Q(destination='FRIEND', target_user=profile.user_id)
+        ).visible_to(request.user)
+        posts = PostModelSerializer.setup_eager_loading(posts)
 
-        data = PostModelSerializer(posts, many=True).data
-        return Response(data, status=status.HTTP_200_OK)
+        if self.paginator.is_streaming(request):
+            return self.paginator.get_streaming_response(
+                posts, request, PostModelSerializer)
+
+        response = self.check_not_modified(
+            render_states(self.paginator.get_window(posts, request)))
+        if response is not None:
+            return response
+
+        page = self.paginate_queryset(posts)
+        data = PostModelSerializer(page, many=True).data
+        return self.get_paginated_response(data)
 
     @action(detail=True, methods=['get'])
     def friends(self, request, *args, **kwargs):
         """List all friends."""
         profile = self.get_object()
-        friends = profile.friends
-        serializer = UserModelSummarySerializer(friends, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(profile.friends.all())
+        serializer = UserModelSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def follow(self, request, *args, **kwargs):
@@ -121,33 +139,38 @@ class ProfileViewSet(mixins.ListModelMixin,
                 'message': f'you stopped following to {profile.user.username}'}
         profile.save()
         user.save()
+        invalidate_pulled_sources(user)
+        refresh_feed_source.delay(user.pk, author_pk=profile.user_id)
         return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'])
     def followers(self, request, *args, **kwargs):
         """List all followers."""
         profile = self.get_object()
-        followers = profile.followers
-        serializer = UserModelSummarySerializer(followers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(profile.followers.all())
+        serializer = UserModelSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def following(self, request, *args, **kwargs):
         """List all following."""
         profile = self.get_object()
-        following = profile.following
-        serializer = UserModelSummarySerializer(following, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(profile.following.all())
+        serializer = UserModelSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def delete_friend(self, request, *args, **kwargs):
         """Remove a friend."""
         user, profile = request.user, self.get_object()
-        if user in profile.friends.all():
+        if is_friend(user, profile.user):
             profile.friends.remove(user)
             user.profile.friends.remove(profile.user)
             profile.save()
             user.profile.save()
+            invalidate_friends(user, profile.user)
+            refresh_feed_source.delay(user.pk, author_pk=profile.user_id)
+            refresh_feed_source.delay(profile.user_id, author_pk=user.pk)
             friend_request = FriendRequest.objects.get(
                 requesting_user__in=[user, profile.user], 
                 requested_user__in=[user, profile.user])
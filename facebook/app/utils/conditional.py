@@ -0,0 +1,107 @@
+"""Conditional requests utilities."""
+
+# Utilities
+from datetime import datetime
+from hashlib import md5
+
+# Django
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# Django REST Framework
+from rest_framework.response import Response
+
+
+def get_rows(queryset, fields=('modified',)):
+    """Return the pk and the given fields of the rows of a queryset."""
+    return list(queryset.values_list('pk', *fields))
+
+
+def get_validators(rows, dated=True):
+    """
+    Return the ETag and the Last-Modified timestamp of a response
+    built from the rows. The rows hold the pk and what the body
+    depends on, so a deleted, added or updated row changes the ETag
+    without serializing anything.
+    dated: False for lists, removing a row does not move the newest
+    date so they are only validated by the ETag.
+    """
+    digest = md5(repr(rows).encode()).hexdigest()
+    if not dated:
+        return quote_etag(digest), None
+    dates = [value for row in rows for value in row if isinstance(value, datetime)]
+    return quote_etag(digest), int(max(dates).timestamp()) if dates else None
+
+
+def not_modified(request, validators):
+    """Return a 304 response if the client copy is still valid, or None."""
+    etag, last_modified = validators
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, validators)
+    return response
+
+
+def set_validators(response, validators):
+    """Add the ETag and Last-Modified headers to a response."""
+    etag, last_modified = validators
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class ConditionalMixin:
+    """
+    Conditional GET mixin.
+    Answer the list and retrieve actions with 304 Not Modified when
+    the validators of the rows match the request, the rows are read
+    with a values query and the body is only serialized on a miss.
+    """
+
+    conditional_fields = ('modified',)
+    validators = None
+
+    def get_conditional_rows(self, queryset):
+        """Return the rows the validators are computed from."""
+        return get_rows(queryset, self.conditional_fields)
+
+    def check_not_modified(self, rows, many=True):
+        """
+        Keep the validators of the rows and return a 304 if they match.
+        many: the rows are a list, only validated by the ETag.
+        """
+        self.validators = get_validators(rows, dated=not many)
+        return not_modified(self.request, self.validators)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Add the validators to a successful response."""
+        response = super(ConditionalMixin, self).finalize_response(
+            request, response, *args, **kwargs)
+        if self.validators is not None and response.status_code == 200:
+            set_validators(response, self.validators)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """List the objects of the page unless the client copy is valid."""
+        queryset = self.filter_queryset(self.get_queryset())
+        response = self.check_not_modified(self.get_conditional_rows(
+            self.paginator.get_window(queryset, request)))
+        if response is not None:
+            return response
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve the object unless the client copy is valid."""
+        instance = self.get_object()
+        response = self.check_not_modified(self.get_conditional_rows(
+            self.get_queryset().filter(pk=instance.pk)), many=False)
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
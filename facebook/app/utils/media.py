@@ -0,0 +1,169 @@
+"""Media serving utilities."""
+
+# Django
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+# Utilities
+import mimetypes
+import os
+import re
+from stat import S_ISREG
+from urllib.parse import quote
+from app.utils.conditional import not_modified, set_validators
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Names of the content-addressed storage, the content never changes
+DIGEST_RE = re.compile(r'^([0-9a-f]{64})\.\w+$')
+CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """The range starts after the end of the file."""
+
+
+def get_file_validators(name, stat):
+    """
+    Return the ETag and the Last-Modified timestamp of a media file,
+    the digest of a content-addressed name is a strong ETag.
+    """
+    match = DIGEST_RE.match(os.path.basename(name))
+    if match is not None:
+        etag = match.group(1)
+    else:
+        etag = '{:x}-{:x}'.format(stat.st_size, int(stat.st_mtime))
+    return quote_etag(etag), int(stat.st_mtime)
+
+
+def parse_range(header, size):
+    """
+    Return the first and last byte asked by a Range header, or None
+    to send the whole file: no header, a header that is not a single
+    byte range, or an invalid one.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+
+    if not first:
+        # Sufijo: los ultimos bytes del archivo
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+
+    first = int(first)
+    if last and int(last) < first:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiable
+    return first, min(int(last), size - 1) if last else size - 1
+
+
+def range_applies(request, validators):
+    """Return whether the If-Range header, if any, matches the file."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is None:
+        return True
+    etag, last_modified = validators
+    if if_range.startswith(('"', 'W/')):
+        # Only a strong ETag validates a range
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def read_range(file, length):
+    """Yield length bytes of the file from its position, then close it."""
+    with file:
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def send_file(request, path, fullpath, size, validators):
+    """
+    Return the response with the file, or the part asked by a Range
+    header. Whole files and ranges up to the end go as a FileResponse,
+    the WSGI server sends them with sendfile when it can.
+    """
+    content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+
+    header = settings.MEDIA_ACCEL_HEADER
+    if header:
+        # The front server sends the file and answers the ranges itself
+        response = HttpResponse(content_type=content_type)
+        if header == 'X-Sendfile':
+            response[header] = fullpath
+        else:
+            response[header] = quote(settings.MEDIA_ACCEL_PREFIX + path)
+        return response
+
+    byte_range = None
+    if range_applies(request, validators):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */{}'.format(size)
+            return response
+
+    first, last = byte_range or (0, size - 1)
+    length = last - first + 1
+    status = 200 if byte_range is None else 206
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type, status=status)
+    else:
+        file = open(fullpath, 'rb')
+        file.seek(first)
+        if last == size - 1:
+            response = FileResponse(file, content_type=content_type, status=status)
+        else:
+            response = StreamingHttpResponse(
+                read_range(file, length), content_type=content_type, status=status)
+
+    response['Content-Length'] = length
+    if byte_range is not None:
+        response['Content-Range'] = 'bytes {}-{}/{}'.format(first, last, size)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file of the media root with conditional and Range
+    requests, so seeking in a video only downloads the rest of it.
+    The responses are cached by the clients, content-addressed files
+    for good.
+    """
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(fullpath)
+    except (SuspiciousFileOperation, FileNotFoundError, NotADirectoryError):
+        raise Http404('The file does not exist.')
+    if not S_ISREG(stat.st_mode):
+        raise Http404('The file does not exist.')
+
+    validators = get_file_validators(path, stat)
+    response = not_modified(request, validators)
+    if response is None:
+        response = send_file(request, path, fullpath, stat.st_size, validators)
+        set_validators(response, validators)
+    response['Accept-Ranges'] = 'bytes'
+
+    if response.status_code in (200, 206, 304):
+        directives = {'public': True, 'max_age': settings.MEDIA_CACHE_MAX_AGE}
+        if DIGEST_RE.match(os.path.basename(path)):
+            directives['immutable'] = True
+        patch_cache_control(response, **directives)
+    return response
@@ -0,0 +1,139 @@
+"""Pagination utilities."""
+
+# Django
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+
+# Django REST Framework
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Utilities
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from app.utils.streaming import stream_json
+
+
+def seek(queryset, position, ordering=('-created', '-id')):
+    """
+    Order a queryset by a (created, id) pair, newest first unless
+    the ordering is ascending, and keep the rows that come after
+    the position.
+    """
+    created, pk = [field.lstrip('-') for field in ordering]
+    after = 'lt' if ordering[0].startswith('-') else 'gt'
+    queryset = queryset.order_by(*ordering)
+    if position is not None:
+        queryset = queryset.filter(
+            Q(**{f'{created}__{after}': position[0]})
+            | Q(**{created: position[0], f'{pk}__{after}': position[1]}))
+    return queryset
+
+
+class FbCursorPagination(BasePagination):
+    """
+    Facebook cursor pagination.
+
+    Pages are sliced newest first with a keyset predicate on
+    (created, id) instead of an offset, so every page costs the
+    same index range scan however long the history is.
+    The cursor is an opaque token holding the position of the
+    last object of the previous page.
+    With ?stream=true every object after the cursor is streamed
+    in a single response instead of a page.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+    stream_query_param = 'stream'
+    stream_chunk_size = 200
+
+    # (datetime, unique integer) pair, descending or ascending
+    ordering = ('-created', '-id')
+
+    def get_window(self, queryset, request):
+        """
+        Return the rows that follow the cursor position, one more
+        than the page size to know if there is a next page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        return seek(queryset, position, self.ordering)[:self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page that follows the cursor position."""
+        results = list(self.get_window(queryset, request))
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def is_streaming(self, request):
+        """Return True if the client asked for the streaming mode."""
+        return request.query_params.get(self.stream_query_param) == 'true'
+
+    def get_streaming_response(self, queryset, request, serializer_class):
+        """Return a response streaming every object after the cursor."""
+        position = self.decode_cursor(request)
+        queryset = seek(queryset, position, self.ordering)
+        return StreamingHttpResponse(
+            stream_json(queryset, serializer_class, self.stream_chunk_size),
+            content_type='application/json')
+
+    def get_paginated_response(self, data):
+        """Return the page results and the link to the next page."""
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_page_size(self, request):
+        """Return the page size requested by the client."""
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_position(self, obj):
+        """Return the (created, id) position of an object."""
+        created, pk = [field.lstrip('-') for field in self.ordering]
+        return getattr(obj, created), getattr(obj, pk)
+
+    def get_next_link(self):
+        """Return the url of the next page."""
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self.get_position(self.page[-1]))
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, position):
+        """Return the opaque token of a position."""
+        created, pk = position
+        token = '{}|{}'.format(created.isoformat(), pk)
+        return urlsafe_b64encode(token.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        """Return the position held by the cursor of the request."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        return self.parse_cursor(encoded)
+
+    def parse_cursor(self, encoded):
+        """Return the position held by an opaque token."""
+        try:
+            token = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            created, pk = token.split('|')
+            created = parse_datetime(created)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created, pk
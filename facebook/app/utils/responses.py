@@ -0,0 +1,110 @@
+"""Anonymous response cache."""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+
+# Django REST Framework
+from rest_framework.response import Response
+
+# Utilities
+from functools import wraps
+from hashlib import md5
+from time import monotonic, sleep
+from app.utils.conditional import not_modified
+
+
+VERSION_KEY = 'responses:version:{}:{}'
+RESPONSE_KEY = 'responses:{}:{}:{}:{}'
+LOCK_POLL = 0.05
+
+
+def get_version(scope, name):
+    """Return the version of the cached responses of an object."""
+    key = VERSION_KEY.format(scope, name)
+    cache.add(key, 1, None)
+    return cache.get(key, 1)
+
+
+def invalidate_responses(scope, name):
+    """Bump the version of an object, its cached responses are not read again."""
+    key = VERSION_KEY.format(scope, name)
+    cache.add(key, 1, None)
+    cache.incr(key)
+
+
+def invalidate_post_responses(post):
+    """Drop the cached responses that list the post, the pages of its page."""
+    if post.page_id is not None:
+        invalidate_responses('pages', post.name_destination)
+
+
+def get_or_build(key, build, timeout):
+    """
+    Return the cached value of the key or build it. A cold key is
+    built by the request holding its lock, the others wait for the
+    value instead of running the same queries, until the lock expires.
+    build: returns the value, or None if it must not be cached.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock = key + ':lock'
+    deadline = monotonic() + settings.RESPONSE_CACHE_LOCK_TIMEOUT
+    locked = cache.add(lock, 1, settings.RESPONSE_CACHE_LOCK_TIMEOUT)
+    while not locked and monotonic() < deadline:
+        sleep(LOCK_POLL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        locked = cache.add(lock, 1, settings.RESPONSE_CACHE_LOCK_TIMEOUT)
+
+    try:
+        value = build()
+        if value is not None:
+            cache.set(key, value, timeout)
+        return value
+    finally:
+        if locked:
+            cache.delete(lock)
+
+
+def cache_anonymous(scope):
+    """
+    Serve the view action to anonymous requests from the shared cache.
+    The key holds the version of the object named by the lookup of the
+    url, so bumping it with invalidate_responses() drops every page.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.user.is_authenticated:
+                return method(self, request, *args, **kwargs)
+
+            name = kwargs[self.lookup_url_kwarg or self.lookup_field]
+            url = md5(request.build_absolute_uri().encode()).hexdigest()
+            key = RESPONSE_KEY.format(scope, name, get_version(scope, name), url)
+
+            built = []
+
+            def build():
+                response = method(self, request, *args, **kwargs)
+                built.append(response)
+                # Only complete pages, not errors nor 304 or streams
+                if isinstance(response, Response) and response.status_code == 200:
+                    return response.data, self.validators
+                return None
+
+            entry = get_or_build(key, build, settings.RESPONSE_CACHE_TIMEOUT)
+            if built:
+                return built[0]
+
+            data, self.validators = entry
+            if self.validators is not None:
+                response = not_modified(request, self.validators)
+                if response is not None:
+                    return response
+            return Response(data)
+        return wrapper
+    return decorator
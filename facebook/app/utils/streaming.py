@@ -0,0 +1,41 @@
+"""Streaming utilities."""
+
+# Utilities
+from itertools import islice
+
+# Django
+from django.db.models import prefetch_related_objects
+
+# Django REST Framework
+from rest_framework.renderers import JSONRenderer
+
+
+def chunks(iterable, size):
+    """Yield lists of at most size items of the iterable."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def stream_json(queryset, serializer_class, chunk_size):
+    """
+    Yield the serialized queryset as a JSON list of results.
+    Rows are read with a server side cursor and serialized one chunk
+    at a time, the prefetches of the queryset are made per chunk
+    because iterator() ignores them, so memory is bounded by the
+    chunk size whatever the number of rows.
+    """
+    lookups = queryset._prefetch_related_lookups
+    rows = queryset.prefetch_related(None).iterator(chunk_size=chunk_size)
+    renderer = JSONRenderer()
+
+    yield b'{"next":null,"results":['
+    separator = b''
+    for chunk in chunks(rows, chunk_size):
+        prefetch_related_objects(chunk, *lookups)
+        for item in serializer_class(chunk, many=True).data:
+            yield separator + renderer.render(item)
+            separator = b','
+    yield b']}'
@@ -0,0 +1,44 @@
+"""Upload handlers utilities."""
+
+# Utilities
+from hashlib import sha256
+
+# Django
+from django.core.files.uploadhandler import (MemoryFileUploadHandler,
+                                             TemporaryFileUploadHandler)
+
+
+class HashingMixin:
+    """
+    Hash the chunks of an upload as they are received, the uploaded
+    file gets the hex SHA-256 of its content in content_hash. No extra
+    pass over the file is needed to store it by content.
+    """
+
+    def new_file(self, *args, **kwargs):
+        """Start the hash of a new file."""
+        # Before super, the memory handler stops the chain from there
+        self.hasher = sha256()
+        super(HashingMixin, self).new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        """Add a chunk to the hash and pass it to the handler."""
+        # El handler en memoria solo recibe los archivos pequenos
+        if getattr(self, 'activated', True):
+            self.hasher.update(raw_data)
+        return super(HashingMixin, self).receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        """Set the hash on the file built by the handler."""
+        file = super(HashingMixin, self).file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.hasher.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(HashingMixin, MemoryFileUploadHandler):
+    """Keep small uploads in memory and hash them."""
+
+
+class HashingTemporaryFileUploadHandler(HashingMixin, TemporaryFileUploadHandler):
+    """Stream large uploads to a temporary file and hash them."""
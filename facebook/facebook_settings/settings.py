@@ -146,6 +146,29 @@ AUTH_USER_MODEL = 'users.User'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Media serving
+# With MEDIA_ACCEL_HEADER the front server sends the files: nginx with
+# 'X-Accel-Redirect' and an internal location at MEDIA_ACCEL_PREFIX
+# aliased to MEDIA_ROOT, Apache or lighttpd with 'X-Sendfile'.
+MEDIA_ACCEL_HEADER = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Uploads are hashed while they are received, to be stored by content
+FILE_UPLOAD_HANDLERS = [
+    'app.utils.uploads.HashingMemoryFileUploadHandler',
+    'app.utils.uploads.HashingTemporaryFileUploadHandler',
+]
+
+# Resumable video uploads
+# The chunks are written under the staging root, outside of the media
+# root and on the same disk so a finalized upload is moved, not copied.
+# Uploads not used by a post are deleted after the expiration, in seconds.
+UPLOAD_STAGING_ROOT = os.path.join(BASE_DIR, 'uploads')
+UPLOAD_MAX_SIZE = 4 * 1024 ** 3
+UPLOAD_CHUNK_MAX_SIZE = 16 * 1024 ** 2
+UPLOAD_EXPIRATION = 60 * 60 * 24
+
 # Email
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -156,7 +179,8 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'app.utils.pagination.FbCursorPagination'
 }
 
 # Celery
@@ -166,6 +190,51 @@ accept_content = ['json']
 task_serializer = 'json'
 result_serializer = 'json'
 
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://redis:6379/1',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        }
+    }
+}
+
+# Feeds
+# Authors and pages with more followers than this are not pushed into
+# the home feed of each follower, their posts are pulled at read time.
+FEED_PULL_THRESHOLD = 5000
+
+# Latest posts of an author, a group or a page added to a home feed
+# when its user becomes a friend, a member or a follower.
+FEED_BACKFILL = 50
+
+# Ranked feed (?ranking=top): newest candidates scored, cached in seconds
+FEED_RANKING_CANDIDATES = 500
+FEED_RANKING_TIMEOUT = 60 * 5
+FEED_RANKING_WEIGHTS = {
+    'reactions': 1.0,
+    'comments': 2.0,
+    'shares': 3.0,
+    'affinity': 0.5,
+    'friend': 1.0,
+    'gravity': 1.5,
+}
+
+# Counters
+# Posts with a counter above the threshold are hot: their increments
+# are written behind through the counter buffer and flushed by beat,
+# without a buffer they are spread over shards folded every few minutes.
+POST_COUNTER_SHARDS = 16
+POST_COUNTER_SHARD_THRESHOLD = 10000
+POST_COUNTER_BUFFER = 'app.posts.buffers.RedisCounterBuffer'
+# Longest flush in seconds, a beat run is skipped while one is running
+POST_COUNTER_FLUSH_LOCK_TIMEOUT = 60 * 5
+
+# Last reactors returned with the reaction summary
+REACTIONS_TOP = 3
+
 # Redis Channel layer
 CHANNEL_LAYERS = {
     'default': {
@@ -175,3 +244,31 @@ CHANNEL_LAYERS = {
         },
     },
 }
+
+# Chat messages
+# Written behind their delivery in batches of up to CHAT_BUFFER_SIZE
+# messages, CHAT_BUFFER_DELAY seconds after the first one was queued.
+# A batch is dropped after CHAT_BUFFER_MAX_RETRIES failed flushes and
+# new messages are rejected while CHAT_BUFFER_MAX_PENDING are queued.
+CHAT_BUFFER_DELAY = 0.01
+CHAT_BUFFER_SIZE = 100
+CHAT_BUFFER_MAX_PENDING = 10000
+CHAT_BUFFER_MAX_RETRIES = 5
+
+# Anonymous response cache
+# Responses to anonymous reads of pages and profiles, in seconds. The
+# lock lets a single request build a cold entry while the others wait.
+RESPONSE_CACHE_TIMEOUT = 60
+RESPONSE_CACHE_LOCK_TIMEOUT = 10
+
+# Media pipeline
+# Longest side in pixels of the picture renditions, made by a task off
+# the request path. Video posters are taken at the offset in seconds.
+MEDIA_RENDITIONS = {
+    'full': 2048,
+    'feed': 720,
+    'thumbnail': 160,
+}
+MEDIA_RENDITION_QUALITY = 85
+MEDIA_POSTER_OFFSET = 1
+FFMPEG_BINARY = 'ffmpeg'
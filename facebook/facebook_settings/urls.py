@@ -2,9 +2,11 @@
 
 # Django
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+# Utilities
+from app.utils.media import serve_media
 
 urlpatterns = [
     
@@ -14,6 +16,7 @@ urlpatterns = [
     path('', include(('app.groups.urls', 'groups'), namespace='groups')),
     path('', include(('app.fbpages.urls', 'pages'), namespace='pages')),
     path('', include(('app.notifications.urls', 'notifications'), namespace='notifications')),
-    path('', include(('app.chats.urls', 'chats'), namespace='chats'))
+    path('', include(('app.chats.urls', 'chats'), namespace='chats')),
+    re_path(r'^{}(?P<path>.+)$'.format(settings.MEDIA_URL.lstrip('/')), serve_media),
     
-]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
@@ -20,6 +20,18 @@ app.conf.beat_schedule = {
     'add-every-1-day': {
             'task': 'taskapp.tasks.notifications.delete_notifications',
             'schedule': crontab(minute=0, hour=0)
+        },
+    'flush-counters-every-10-seconds': {
+            'task': 'taskapp.tasks.posts.flush_post_counters',
+            'schedule': 10.0
+        },
+    'fold-counters-every-5-minutes': {
+            'task': 'taskapp.tasks.posts.fold_post_counters',
+            'schedule': crontab(minute='*/5')
+        },
+    'delete-stale-uploads-every-hour': {
+            'task': 'taskapp.tasks.media.delete_stale_uploads',
+            'schedule': crontab(minute=30)
         }
     }
 
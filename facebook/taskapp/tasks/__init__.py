@@ -1,2 +1,4 @@
 from .users import *
-from .notifications import *
\ No newline at end of file
+from .notifications import *
+from .posts import *
+from .media import *
\ No newline at end of file
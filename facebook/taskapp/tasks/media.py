@@ -0,0 +1,68 @@
+"""Media tasks."""
+
+from __future__ import absolute_import, unicode_literals
+
+from PIL import Image, UnidentifiedImageError
+
+# Django
+from django.conf import settings
+from django.utils import timezone
+
+# Celery
+from taskapp.celery import app
+
+# Models
+from app.posts.models import Picture, Post, Upload, Video
+
+# Utilities
+from datetime import timedelta
+from subprocess import CalledProcessError, TimeoutExpired
+from app.posts.media import make_poster, make_renditions
+from app.posts.storage import delete_media, discard_upload
+
+
+# Asynch task
+@app.task
+def process_media(picture_pks, video_pks):
+    """
+    Make the renditions of the pictures and the posters of the videos
+    of a post. An unreadable upload is skipped, clients fall back to
+    its content. The posts are touched so their cached renders and
+    validators change.
+    """
+    for picture in Picture.objects.filter(pk__in=picture_pks):
+        try:
+            make_renditions(picture)
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+            continue
+
+    for video in Video.objects.filter(pk__in=video_pks):
+        try:
+            make_poster(video)
+        except (OSError, CalledProcessError, TimeoutExpired, UnidentifiedImageError):
+            continue
+
+    Post.objects.filter(pictures__in=picture_pks).update(modified=timezone.now())
+    Post.objects.filter(videos__in=video_pks).update(modified=timezone.now())
+
+
+@app.task
+def delete_orphan_media(picture_pks, video_pks):
+    """
+    Delete the pictures and videos of a deleted post that no other
+    post shows and release their files, a file is removed from the
+    storage with its last reference.
+    """
+    delete_media(Picture.objects.filter(pk__in=picture_pks, post__isnull=True))
+    delete_media(Video.objects.filter(pk__in=video_pks, post__isnull=True))
+
+
+@app.task
+def delete_stale_uploads():
+    """
+    Delete the chunked uploads left unfinished or not used by a post
+    for longer than the expiration, with their files.
+    """
+    date = timezone.now() - timedelta(seconds=settings.UPLOAD_EXPIRATION)
+    for upload in Upload.objects.filter(modified__lte=date):
+        discard_upload(upload)
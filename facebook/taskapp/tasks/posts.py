@@ -0,0 +1,137 @@
+"""Posts tasks."""
+
+from __future__ import absolute_import, unicode_literals
+
+# Django
+from django.conf import settings
+
+# Celery
+from taskapp.celery import app
+
+# Models
+from app.fbpages.models import Page
+from app.groups.models import Membership
+from app.posts.models import FeedEntry, Post
+
+# Utilities
+from app.posts.counters import flush_counter_buffer, fold_counter_shards
+from app.posts.feeds import is_pulled
+from app.users.friends import friends_of
+
+
+def get_feed_recipients(post):
+    """
+    Return the pks of the users whose home feed must show the post.
+    Privacy is evaluated here, once, instead of on every feed read.
+    Followers of authors and pages above the pull threshold are
+    skipped, those posts are merged into their feeds at read time.
+    """
+    recipients = {post.user_id}
+
+    if post.destination == 'PAGE':
+        followers = Page.page_followers.through.objects.filter(
+            page_id=post.page_id)
+        if not is_pulled(followers.count()):
+            recipients.update(followers.values_list('user_id', flat=True))
+        return recipients
+
+    if post.destination == 'GROUP':
+        members = Membership.objects.filter(
+            group_id=post.group_id,
+            is_active=True).values_list('user', flat=True)
+        recipients.update(members)
+        return recipients
+
+    friends = set(friends_of(post.user_id))
+
+    if post.privacy == 'PUBLIC':
+        followers = post.profile.followers.through.objects.filter(
+            profile_id=post.profile_id)
+        if not is_pulled(followers.count()):
+            recipients.update(friends)
+            recipients.update(followers.values_list('user_id', flat=True))
+    elif post.privacy == 'FRIENDS':
+        recipients.update(friends)
+    elif post.privacy == 'SPECIFIC_FRIENDS':
+        recipients.update(post.specific_friends.values_list('pk', flat=True))
+    elif post.privacy == 'FRIENDS_EXC':
+        excluded = set(post.friends_exc.values_list('pk', flat=True))
+        recipients.update(friends - excluded)
+
+    # Posts published in the biography of a friend
+    if post.destination == 'FRIEND' and post.target_user_id is not None:
+        recipients.add(post.target_user_id)
+    return recipients
+
+
+# Asynch task
+@app.task
+def fan_out_post(post_pk):
+    """
+    Write a post into the home feed of every user that can see it.
+    Running it again for an updated post removes the entries of the
+    users that can no longer see it.
+    """
+    try:
+        post = Post.objects.select_related('profile').get(pk=post_pk)
+    except Post.DoesNotExist:
+        return
+
+    recipients = get_feed_recipients(post)
+    FeedEntry.objects.filter(post=post).exclude(user__in=recipients).delete()
+
+    entries = [
+        FeedEntry(user_id=user_pk, post=post, post_created=post.created)
+        for user_pk in recipients]
+    FeedEntry.objects.bulk_create(
+        entries, batch_size=1000, ignore_conflicts=True)
+
+
+@app.task
+def refresh_feed_source(user_pk, author_pk=None, group_pk=None, page_pk=None):
+    """
+    Evaluate again the posts of an author, a group or a page in the
+    home feed of a user after a friendship, a membership or a follow
+    changed: the entries of the posts the user can no longer see are
+    removed and the latest posts the user can now see are added.
+    """
+    if author_pk is not None:
+        posts = Post.objects.filter(user_id=author_pk).exclude(
+            destination__in=['GROUP', 'PAGE'])
+    elif group_pk is not None:
+        posts = Post.objects.filter(group_id=group_pk, destination='GROUP')
+    else:
+        posts = Post.objects.filter(page_id=page_pk, destination='PAGE')
+    posts = posts.select_related('profile')
+
+    shown = set(FeedEntry.objects.filter(
+        user_id=user_pk, post__in=posts).values_list('post_id', flat=True))
+    candidates = list(posts.order_by('-created', '-id')[:settings.FEED_BACKFILL])
+    candidates += posts.filter(pk__in=shown - {post.pk for post in candidates})
+
+    hidden, entries = [], []
+    for post in candidates:
+        if user_pk in get_feed_recipients(post):
+            if post.pk not in shown:
+                entries.append(FeedEntry(
+                    user_id=user_pk, post=post, post_created=post.created))
+        elif post.pk in shown:
+            hidden.append(post.pk)
+
+    FeedEntry.objects.filter(user_id=user_pk, post_id__in=hidden).delete()
+    FeedEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+# Periodic tasks
+@app.task
+def flush_post_counters():
+    """Write the buffered counter deltas of the hot posts."""
+    flush_counter_buffer()
+
+
+@app.task
+def fold_post_counters():
+    """Fold the counter shards of the hot posts into their columns."""
+    posts = Post.objects.filter(sharded_counters=True).values_list('pk', flat=True)
+    for post_pk in posts.iterator():
+        fold_counter_shards(post_pk)